@@ -1,17 +1,21 @@
 # /// script
 # requires-python = ">=3.13"
 # dependencies = [
+#     "orjson",
 #     "pandas",
+#     "pyarrow",
 #     "rich",
 # ]
 # ///
 
 import argparse
-import json
 import logging
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import orjson
 import pandas as pd
 from rich.logging import RichHandler
 
@@ -27,45 +31,79 @@ logging.basicConfig(
 log_text = logging.getLogger("rich")
 log_text.setLevel(20)
 
+# orjson always emits UTF-8, matching the previous ensure_ascii=False output
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+# Each JSON file is read and written with a single call through a 1 MiB buffer
+IO_BUFFER_SIZE = 1 << 20
 
-def process_doi_integration(csv_file_path: str, scholar_results_folder: str):
+
+def read_csv_file(csv_file_path: str) -> pd.DataFrame:
     """
-    Process CSV file and update/create JSON files with DOI and PMID information
+    Read the columns needed for the integration from the CSV file
 
     Args:
         csv_file_path (str): Path to the CSV file containing BioProject, doi_results, and PMIDs columns
+
+    Returns:
+        pd.DataFrame: DataFrame with the BioProject, doi_results, and PMIDs columns
+    """
+    # Read only the needed columns of the CSV file with the multithreaded Arrow parser
+    return pd.read_csv(
+        csv_file_path,
+        header=0,
+        usecols=["BioProject", "doi_results", "PMIDs"],
+        dtype="string",
+        engine="pyarrow",
+    )
+
+
+def process_doi_integration(df: pd.DataFrame, scholar_results_folder: str):
+    """
+    Process CSV data and update/create JSON files with DOI and PMID information
+
+    Args:
+        df (pd.DataFrame): DataFrame containing BioProject, doi_results, and PMIDs columns
         scholar_results_folder (str): Path to the folder containing existing JSON files
     """
 
-    # Read the CSV file
-    df = pd.read_csv(csv_file_path, header=0, low_memory=False)
+    # Normalize blank/NaN values and split PMIDs once per column instead of per row
+    df = df.assign(
+        doi_results=df["doi_results"].fillna("").astype(str).str.strip(),
+        PMIDs=df["PMIDs"]
+        .fillna("")
+        .astype(str)
+        .str.split(";")
+        .map(lambda pmids: [pmid.strip() for pmid in pmids if pmid.strip()]),
+    )
+    runs_per_bioproject = df["BioProject"].value_counts()
+
+    # Only rows with DOI results or PMIDs need a JSON file
+    has_data = df["doi_results"].ne("") | df["PMIDs"].map(len).gt(0)
+    skipped_rows = int((~has_data).sum())
+    if skipped_rows:
+        log_text.info(
+            f"No DOI results or PMIDs found for {skipped_rows} rows, skipping..."
+        )
+
+    # Rows are grouped per BioProject so each JSON file is only touched by one worker
+    bioproject_updates = defaultdict(list)
 
     # Process each row in the CSV
-    for index, row in df.iterrows():
-        bioproject_id = row["BioProject"]
-        doi_results_str = row.get("doi_results", "")
-        pmids_str = row.get("PMIDs", "")
-        runs_for_bioproject = len(df[df["BioProject"] == bioproject_id])
+    for row in df[has_data].itertuples(index=False, name="Row"):
+        bioproject_id = row.BioProject
+        doi_results_str = row.doi_results
+        pmids = row.PMIDs
 
         # Parse the doi_results JSON string (handle blank/empty values)
         doi_results = []
-        if (
-            doi_results_str
-            and pd.notna(doi_results_str)
-            and str(doi_results_str).strip()
-        ):
+        if doi_results_str:
             try:
-                doi_results = json.loads(doi_results_str)
-            except (json.JSONDecodeError, TypeError) as e:
+                doi_results = orjson.loads(doi_results_str)
+            except (orjson.JSONDecodeError, TypeError) as e:
                 log_text.info(
                     f"Warning: Could not parse doi_results for {bioproject_id}: {e}"
                 )
 
-        # Parse PMIDs (handle blank/empty values)
-        pmids = []
-        if pmids_str and pd.notna(pmids_str) and str(pmids_str).strip():
-            pmids = [pmid.strip() for pmid in str(pmids_str).split(";") if pmid.strip()]
-
         # Skip if no data to process
         if not doi_results and not pmids:
             log_text.info(
@@ -73,68 +111,123 @@ def process_doi_integration(csv_file_path: str, scholar_results_folder: str):
             )
             continue
 
-        # Define the JSON file path
-        json_file_path = os.path.join(
-            scholar_results_folder, f"{bioproject_id}_articles.json"
-        )
+        # Map each successfully resolved link to its DOI once per CSV row
+        link_to_doi = {
+            item["link"]: item["doi"]
+            for item in doi_results
+            if item.get("status") == "success" and "link" in item and "doi" in item
+        }
+
+        bioproject_updates[bioproject_id].append((doi_results, link_to_doi, pmids))
+
+    # Create the output folder once, then list it instead of issuing a stat call
+    # per BioProject
+    os.makedirs(scholar_results_folder, exist_ok=True)
+    with os.scandir(scholar_results_folder) as entries:
+        existing_files = {entry.name for entry in entries}
+
+    # Each BioProject writes a distinct JSON file, so they can be processed in parallel
+    with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4) as executor:
+        futures = [
+            executor.submit(
+                integrate_bioproject,
+                os.path.join(scholar_results_folder, f"{bioproject_id}_articles.json"),
+                bioproject_id,
+                updates,
+                int(runs_per_bioproject.get(bioproject_id, 0)),
+                f"{bioproject_id}_articles.json" in existing_files,
+            )
+            for bioproject_id, updates in bioproject_updates.items()
+        ]
+        for future in futures:
+            future.result()
+
 
+def integrate_bioproject(
+    json_file_path: str,
+    bioproject_id: str,
+    updates: list[tuple[list, dict, list]],
+    runs_for_bioproject: int,
+    file_exists: bool,
+):
+    """
+    Apply the DOI and PMID updates of one BioProject to its JSON file, in CSV order
+
+    Args:
+        json_file_path (str): Path to the JSON file of the BioProject
+        bioproject_id (str): BioProject ID
+        updates (list[tuple[list, dict, list]]): (doi_results, link_to_doi, pmids)
+            tuples, one per CSV row
+        runs_for_bioproject (int): Number of runs for the BioProject
+        file_exists (bool): Whether the JSON file already exists
+    """
+    for doi_results, link_to_doi, pmids in updates:
         # Check if JSON file exists
-        if os.path.exists(json_file_path):
+        if file_exists:
             # Update existing file
             update_existing_json(
-                json_file_path, doi_results, pmids, runs_for_bioproject
+                json_file_path, link_to_doi, pmids, runs_for_bioproject
             )
         else:
             # Create new file
             create_new_json(
                 json_file_path, doi_results, pmids, bioproject_id, runs_for_bioproject
             )
+            # Later rows of the same BioProject update the file just created
+            file_exists = True
 
 
 def update_existing_json(
-    json_file_path: str, doi_results: list, pmids: list, runs_for_bioproject: int
+    json_file_path: str, link_to_doi: dict, pmids: list, runs_for_bioproject: int
 ):
     """
     Update existing JSON file with DOI and PMID information
 
     Args:
         json_file_path (str): Path to the existing JSON file
-        doi_results (list): List of DOI results to integrate
+        link_to_doi (dict): Mapping of article link to DOI to integrate
         pmids (list): List of PMIDs to integrate
         runs_for_bioproject (int): Number of runs for the BioProject
 
     """
     try:
         # Read existing JSON file
-        with open(json_file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # Create a mapping of link to DOI for quick lookup
-        link_to_doi = {}
-        if doi_results:
-            link_to_doi = {
-                item["link"]: item["doi"]
-                for item in doi_results
-                if item.get("status") == "success" and "link" in item and "doi" in item
-            }
+        with open(json_file_path, "rb", buffering=IO_BUFFER_SIZE) as f:
+            data = orjson.loads(f.read())
+
+        # Track whether anything changed so unchanged files are not rewritten
+        dirty = False
 
         # Update articles with DOI information
         for article in data.get("articles", []):
-            if article["link"] in link_to_doi:
-                article["doi"] = link_to_doi[article["link"]]
+            doi = link_to_doi.get(article["link"])
+            if article["link"] in link_to_doi and article.get("doi") != doi:
+                article["doi"] = doi
+                dirty = True
 
         # Add PMIDs to the main JSON structure if they exist
-        if pmids:
+        if pmids and data.get("PubMedIDs") != pmids:
             data["PubMedIDs"] = pmids
+            dirty = True
 
         # Update total_articles count
-        data["total_articles"] = len(data.get("articles", []))
+        total_articles = len(data.get("articles", []))
+        if data.get("total_articles") != total_articles:
+            data["total_articles"] = total_articles
+            dirty = True
 
         # Update runs count if applicable
-        data["runs"] = runs_for_bioproject
+        if data.get("runs") != runs_for_bioproject:
+            data["runs"] = runs_for_bioproject
+            dirty = True
+
+        if not dirty:
+            log_text.info(f"No changes for existing file: {json_file_path}")
+            return
+
         # Write updated data back to file
-        with open(json_file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(json_file_path, "wb", buffering=IO_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(data, option=JSON_DUMP_OPTIONS))
 
         log_text.info(f"Updated existing file: {json_file_path}")
 
@@ -160,23 +253,20 @@ def create_new_json(
         runs_for_bioproject (int): Number of runs for the BioProject
     """
     try:
-        # Create articles list from doi_results
-        articles = []
-        if doi_results:
-            for doi_item in doi_results:
-                if (
-                    doi_item.get("status") == "success"
-                    and "link" in doi_item
-                    and "doi" in doi_item
-                ):
-                    article = {
-                        "title": None,
-                        "link": doi_item["link"],
-                        "citations": None,
-                        "bioproject_id": bioproject_id,
-                        "doi": doi_item["doi"],
-                    }
-                    articles.append(article)
+        # Create articles list from the successful doi_results
+        articles = [
+            {
+                "title": None,
+                "link": doi_item["link"],
+                "citations": None,
+                "bioproject_id": bioproject_id,
+                "doi": doi_item["doi"],
+            }
+            for doi_item in doi_results
+            if doi_item.get("status") == "success"
+            and "link" in doi_item
+            and "doi" in doi_item
+        ]
 
         # Create the JSON structure
         json_data = {
@@ -193,12 +283,9 @@ def create_new_json(
         # Add runs count if applicable
         json_data["runs"] = runs_for_bioproject
 
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(json_file_path), exist_ok=True)
-
         # Write new JSON file
-        with open(json_file_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
+        with open(json_file_path, "wb", buffering=IO_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(json_data, option=JSON_DUMP_OPTIONS))
 
         log_text.info(f"Created new file: {json_file_path}")
 
@@ -206,31 +293,30 @@ def create_new_json(
         log_text.error(f"Error creating {json_file_path}: {str(e)}")
 
 
-def validate_data_structure(csv_file_path: str):
+def validate_data_structure(df: pd.DataFrame):
     """
-    Validate the CSV file structure and show sample data
+    Validate the CSV data structure and show sample data
 
     Args:
-        csv_file_path (str): Path to the CSV file to validate
+        df (pd.DataFrame): DataFrame read from the CSV file to validate
     """
     try:
-        df = pd.read_csv(csv_file_path, header=0, low_memory=False)
         log_text.info("CSV file structure:")
         log_text.info(f"Columns: {list(df.columns)}")
         log_text.info(f"Total rows: {len(df)}")
         log_text.info("\nSample data (first 3 rows):")
 
-        for i, row in df.head(3).iterrows():
+        for i, row in enumerate(df.head(3).itertuples(index=False)):
             log_text.info(f"\nRow {i + 1}:")
-            log_text.info(f"  BioProject: {row.get('BioProject', 'N/A')}")
+            log_text.info(f"  BioProject: {getattr(row, 'BioProject', 'N/A')}")
             log_text.info(
-                f"  doi_results: {str(row.get('doi_results', 'N/A'))[:100]}..."
+                f"  doi_results: {str(getattr(row, 'doi_results', 'N/A'))[:100]}..."
             )
-            log_text.info(f"  PMIDs: {row.get('PMIDs', 'N/A')}")
+            log_text.info(f"  PMIDs: {getattr(row, 'PMIDs', 'N/A')}")
 
         # Check for blank/empty values
-        blank_doi = df["doi_results"].isna().sum() + (df["doi_results"] == "").sum()
-        blank_pmids = df["PMIDs"].isna().sum() + (df["PMIDs"] == "").sum()
+        blank_doi = int((df["doi_results"].isna() | df["doi_results"].eq("")).sum())
+        blank_pmids = int((df["PMIDs"].isna() | df["PMIDs"].eq("")).sum())
 
         log_text.info(f"\nData quality check:")
         log_text.info(f"  Blank/empty doi_results: {blank_doi}")
@@ -268,11 +354,14 @@ if __name__ == "__main__":
     csv_file_path = args.input  # Path to your CSV file
     scholar_results_folder = args.json_dir  # Path to your JSON files directory
 
+    # Read the CSV file once for both validation and integration
+    df = read_csv_file(csv_file_path)
+
     # # Validate data first (optional but recommended)
     # log_text.info("Validating CSV file structure...")
-    # validate_data_structure(csv_file_path)
+    # validate_data_structure(df)
     # log_text.info("\n" + "="*50 + "\n")
 
     # Process the integration
-    process_doi_integration(csv_file_path, scholar_results_folder)
+    process_doi_integration(df, scholar_results_folder)
     log_text.info("DOI and PMID integration completed!")
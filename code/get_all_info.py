@@ -1,6 +1,7 @@
 # /// script
 # requires-python = ">=3.13"
 # dependencies = [
+#     "lxml",
 #     "pandas",
 #     "requests",
 #     "rich",
@@ -12,11 +13,15 @@
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import threading
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
-from xml.etree import ElementTree as ET
-from random import randint
+from lxml import etree as ET
 from rich.progress import (
     BarColumn,
     Progress,
@@ -42,23 +47,90 @@ logging.basicConfig(
 log_text = logging.getLogger("rich")
 log_text.setLevel(20)
 
+# Compiled XPath queries for E-utilities responses, returning plain strings
+UID_XPATH = ET.XPath("IdList/Id/text()", smart_strings=False)
+LINKSET_XPATH = ET.XPath(".//LinkSet")
+PUBMED_IDS_XPATH = ET.XPath(
+    ".//LinkSetDb[DbTo='pubmed']//Link/Id/text()", smart_strings=False
+)
+BIOPROJECT_IDS_XPATH = ET.XPath(
+    ".//LinkSet//LinkSetDb[DbTo='bioproject']//Link/Id/text()", smart_strings=False
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces calls to a fixed rate."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens, i.e. the allowed burst.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take one token, sleeping only as long as needed for it to be available.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
 
 class SRAInfoExtractor:
-    def __init__(self, email: str, tool_name: str = "sra_pmid_mapper"):
+    def __init__(
+        self, email: str, tool_name: str = "sra_pmid_mapper", max_workers: int = 3
+    ):
         """
         Initialize the extractor and populate the necessary attributes.
 
         Args:
             email (str): User's email for NCBI API.
             tool_name (str): Name of the tool using the API.
+            max_workers (int): Number of runs looked up concurrently.
         """
         self.email = email
         self.tool_name = tool_name
+        self.max_workers = max_workers
 
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
 
-        # Rate limits
-        self.ncbi_delay = 0.3
+        # Shared keep-alive connections to NCBI; HTTP 500 keeps its own retry below
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+
+        # Rate limits: NCBI allows 3 requests per second without an API key
+        self.ncbi_limiter = TokenBucket(rate=3, capacity=3)
+
+        # BioProject UID -> linked PMIDs, shared by all runs of the pass
+        self._bp_to_pmids: dict[str, list[str]] = {}
+        self._bp_to_pmids_lock = threading.Lock()
 
     def _make_ncbi_request(self, endpoint: str, params: dict) -> requests.Response:
         """
@@ -78,9 +150,8 @@ class SRAInfoExtractor:
         url = f"{self.base_url}{endpoint}"
 
         try:
-            response = requests.get(url, params=params, timeout=30)
-            # Rate limiting
-            time.sleep(self.ncbi_delay * randint(1, 3))
+            self.ncbi_limiter.acquire()
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             return response
         except requests.exceptions.HTTPError as e:
@@ -88,7 +159,8 @@ class SRAInfoExtractor:
                 log_text.warning(f"NCBI server error (500) - retrying after delay...")
                 time.sleep(5)  # Wait longer on server error
                 try:
-                    response = requests.get(url, params=params, timeout=30)
+                    self.ncbi_limiter.acquire()
+                    response = self.session.get(url, params=params, timeout=30)
                     response.raise_for_status()
                     return response
                 except:
@@ -111,10 +183,8 @@ class SRAInfoExtractor:
             response = self._make_ncbi_request("esearch.fcgi", params)
             root = ET.fromstring(response.content)
 
-            uid_list = root.find("IdList")
-            if uid_list is not None and len(uid_list) > 0:
-                return uid_list.find("Id").text
-            return None
+            uids = UID_XPATH(root)
+            return uids[0] if uids else None
 
         except Exception as e:
             log_text.warning(f"Error getting UID for {run_accession}: {e}")
@@ -145,7 +215,7 @@ class SRAInfoExtractor:
             pmids = []
 
             # Parse the elink results with better error handling
-            for linkset in root.findall(".//LinkSet"):
+            for linkset in LINKSET_XPATH(root):
                 # Check if there are any errors in the response
                 error_list = linkset.find("ERROR")
                 if error_list is not None:
@@ -154,17 +224,13 @@ class SRAInfoExtractor:
                     )
                     continue
 
-                for linksetdb in linkset.findall(".//LinkSetDb"):
-                    dbto = linksetdb.find("DbTo")
-                    if dbto is not None and dbto.text == "pubmed":
-                        for link in linksetdb.findall(".//Link/Id"):
-                            pmids.append(link.text)
+                pmids.extend(PUBMED_IDS_XPATH(linkset))
 
             # If no direct links, try going through BioProject
             if not pmids:
                 pmids.extend(self._get_pmids_via_bioproject(sra_uid))
 
-            return list(set(pmids))  # Remove duplicates
+            return list(dict.fromkeys(pmids))  # Remove duplicates, keeping order
 
         except Exception as e:
             log_text.warning(f"Error getting PMIDs for SRA UID {sra_uid}: {e}")
@@ -193,17 +259,17 @@ class SRAInfoExtractor:
             response = self._make_ncbi_request("elink.fcgi", params)
             root = ET.fromstring(response.content)
 
-            bioproject_ids = []
-            for linkset in root.findall(".//LinkSet"):
-                for linksetdb in linkset.findall(".//LinkSetDb"):
-                    dbto = linksetdb.find("DbTo")
-                    if dbto is not None and dbto.text == "bioproject":
-                        for link in linksetdb.findall(".//Link/Id"):
-                            bioproject_ids.append(link.text)
+            bioproject_ids = BIOPROJECT_IDS_XPATH(root)
 
             # Now link BioProject to PubMed
             all_pmids = []
             for bp_id in bioproject_ids:
+                with self._bp_to_pmids_lock:
+                    cached_pmids = self._bp_to_pmids.get(bp_id)
+                if cached_pmids is not None:
+                    all_pmids.extend(cached_pmids)
+                    continue
+
                 try:
                     params = {
                         "dbfrom": "bioproject",
@@ -216,17 +282,18 @@ class SRAInfoExtractor:
                     response = self._make_ncbi_request("elink.fcgi", params)
                     root = ET.fromstring(response.content)
 
-                    for linkset in root.findall(".//LinkSet"):
-                        for linksetdb in linkset.findall(".//LinkSetDb"):
-                            dbto = linksetdb.find("DbTo")
-                            if dbto is not None and dbto.text == "pubmed":
-                                for link in linksetdb.findall(".//Link/Id"):
-                                    all_pmids.append(link.text)
+                    bp_pmids = []
+                    for linkset in LINKSET_XPATH(root):
+                        bp_pmids.extend(PUBMED_IDS_XPATH(linkset))
+
+                    with self._bp_to_pmids_lock:
+                        self._bp_to_pmids[bp_id] = bp_pmids
+                    all_pmids.extend(bp_pmids)
                 except Exception as e:
                     log_text.warning(f"Error linking BioProject {bp_id} to PubMed: {e}")
                     continue
 
-            return all_pmids
+            return list(dict.fromkeys(all_pmids))
 
         except Exception as e:
             log_text.warning(
@@ -291,37 +358,58 @@ class SRAInfoExtractor:
 
         df = df.copy()
 
-        # Add new columns
-        df["PMIDs"] = None
-        df["PMID_count"] = 0
-        df["Primary_PMID"] = None
-        df["PMID_source"] = "none"
-
         total_runs = len(df)
 
-        with progress:
-            progress.add_task("[cyan]Processing SRA runs", total=total_runs)
-            for i, row in df.iterrows():
-                run_accession = row[run_column]
-                bioproject_id = (
-                    row.get(bioproject_column, None)
-                    if bioproject_column in df.columns
-                    else None
-                )
+        # Results are collected by row position and assigned as whole columns
+        pmids_col = [None] * total_runs
+        count_col = [0] * total_runs
+        primary_col = [None] * total_runs
+        source_col = ["none"] * total_runs
 
+        with progress, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            progress.add_task("[cyan]Processing SRA runs", total=total_runs)
+            # Plain (run, bioproject) tuples; a missing BioProject column yields NaN
+            # through reindex
+            rows = df.reindex(columns=[run_column, bioproject_column])
+
+            # Repeated run accessions are only looked up once
+            positions_by_run = defaultdict(list)
+            bioproject_by_run = {}
+            for position, (run_accession, bioproject_id) in enumerate(
+                rows.itertuples(index=False, name=None)
+            ):
                 if pd.isna(run_accession):
                     continue
-
-                # Get PMIDs using enhanced method
-                result = self.get_pmid_for_run(run_accession, bioproject_id)
+                positions_by_run[run_accession].append(position)
+                bioproject_by_run.setdefault(run_accession, bioproject_id)
+
+            # Runs are looked up concurrently to overlap the NCBI round-trips
+            futures = {
+                executor.submit(
+                    self.get_pmid_for_run,
+                    run_accession,
+                    bioproject_by_run[run_accession],
+                ): run_accession
+                for run_accession in positions_by_run
+            }
+            for future in as_completed(futures):
+                positions = positions_by_run[futures[future]]
+                result = future.result()
 
                 pmids = result["pmids"]
-                df.at[i, "PMIDs"] = ";".join(pmids) if pmids else None
-                df.at[i, "PMID_count"] = len(pmids)
-                df.at[i, "Primary_PMID"] = pmids[0] if pmids else None
-                df.at[i, "PMID_source"] = result["source"]
+                for position in positions:
+                    pmids_col[position] = ";".join(pmids) if pmids else None
+                    count_col[position] = len(pmids)
+                    primary_col[position] = pmids[0] if pmids else None
+                    source_col[position] = result["source"]
+
+                progress.update(0, advance=len(positions))
 
-                progress.update(0, advance=1)
+        # Add new columns
+        df["PMIDs"] = pmids_col
+        df["PMID_count"] = count_col
+        df["Primary_PMID"] = primary_col
+        df["PMID_source"] = source_col
 
         # Summary statistics
         total_pmids = df["PMID_count"].sum()
@@ -1,25 +1,33 @@
 # /// script
 # requires-python = ">=3.10"
 # dependencies = [
-#     "numpy",
+#     "lxml",
+#     "orjson",
 #     "pandas",
 #     "regex",
+#     "requests",
 #     "rich",
 #     "selenium",
 # ]
 # ///
 import argparse
-import ast
-import json
+import atexit
 import logging
 import os
+import threading
 import time
-from fnmatch import fnmatch
-from random import randint
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+from urllib.parse import urlparse
 
-import numpy as np
+import orjson
 import pandas as pd
 import regex as re
+import requests
+from lxml import etree
+from lxml import html as lxml_html
 from rich.logging import RichHandler
 from rich.progress import (
     BarColumn,
@@ -47,217 +55,512 @@ logging.basicConfig(
 log_text = logging.getLogger("rich")
 log_text.setLevel(20)
 
+# DOI patterns are compiled once per process instead of on every lookup. Each
+# group is a single alternation scanned once, and the named group that matched
+# holds the DOI. DOIs are ASCII, so re.A keeps the character classes ASCII-only
+URL_DOI_PATTERN = re.compile(
+    "|".join(
+        [
+            # bioRxiv: https://www.biorxiv.org/content/10.1101/2021.09.19.460957.abstract
+            r"biorxiv\.org/content/(?P<biorxiv>10\.1101/\d{4}\.\d{2}\.\d{2}\.\d{6})",
+            # OUP/Oxford: https://academic.oup.com/gigascience/article-abstract/doi/10.1093/gigascience/giac035/6575386
+            r"academic\.oup\.com/[^/]+/article[^/]*/doi/(?P<oup>10\.\d{4,}/[^/?&#]+)",
+            # Wiley: https://onlinelibrary.wiley.com/doi/abs/10.1111/tpj.16519
+            r"onlinelibrary\.wiley\.com/doi/(?:abs|full|pdf)?/?(?:10\.1001/)?(?:10\.1111/|10\.1002/)?(?P<wiley>10\.\d{4,}/[^/?&#]+)",
+            # Nature: https://www.nature.com/articles/10.1038/s41586-021-03819-2
+            r"nature\.com/articles/(?P<nature>10\.\d{4,}/[^/?&#]+)",
+            # Springer: https://link.springer.com/article/10.1186/s12864-023-09185-9
+            r"link\.springer\.com/(?:article|chapter|book)/(?P<springer>10\.\d{4,}/[^/?&#]+)",
+            # Frontiers: https://www.frontiersin.org/articles/10.3389/fmicb.2021.685937/full
+            r"frontiersin\.org/articles/(?P<frontiers>10\.\d{4,}/[^/?&#]+)",
+            # BMC: https://bmcgenomics.biomedcentral.com/articles/10.1186/s12864-023-09185-9
+            r"biomedcentral\.com/articles/(?P<bmc>10\.\d{4,}/[^/?&#]+)",
+            # Generic DOI in URL
+            r"(?:dx\.)?doi\.org/(?P<doi_org>10\.\d{4,}/[^/?&#]+)",
+            # Generic pattern for any URL containing DOI (last as fallback)
+            r"/(?:doi/)?(?:abs/|full/|pdf/)?(?P<generic>10\.\d{4,}/[^/?&#\s\.]+)(?:\.[^/?&#]*)?",
+        ]
+    ),
+    re.I | re.A,
+)
+
+# Look for DOI in meta tags - comprehensive patterns. Each <meta> tag is matched
+# once, possessively, and its attributes are then checked in either order
+META_TAG_PATTERN = re.compile(r"<meta\b[^>]*+>", re.I | re.A)
+META_DOI_NAME_ATTR = re.compile(
+    r'(?:name|property)=["\']?(?:DC\.Identifier|citation_doi|dc\.identifier|doi|prism\.doi)',
+    re.I | re.A,
+)
+META_DOI_CONTENT_ATTR = re.compile(
+    r'content=["\']?(10\.\d{4,}/[^"\'>\s]+)', re.I | re.A
+)
+
+# Look for DOI in JSON-LD structured data. This and the text patterns scan the
+# UTF-8 encoded page, since bytes patterns skip the Unicode handling
+JSON_LD_DOI_PATTERN = re.compile(
+    b"|".join(
+        [
+            rb'"doi":\s*"(?P<jsonld_doi>10\.\d{4,}/[^"]+)"',
+            rb'"@id":\s*"(?:https?://(?:dx\.)?doi\.org/)?(?P<jsonld_id>10\.\d{4,}/[^"]+)"',
+        ]
+    ),
+    re.I,
+)
+
+# Look for DOI in text with various formats (case-insensitive, so "doi" also
+# covers "DOI")
+TEXT_DOI_PATTERN = re.compile(
+    b"|".join(
+        [
+            rb'doi[:\s]*(?:https?://(?:dx\.)?doi\.org/)?(?P<text_doi>10\.\d{4,}/[^\s<)"\']+)',
+            rb'https?://(?:dx\.)?doi\.org/(?P<text_url>10\.\d{4,}/[^\s<)"\']+)',
+            rb'Digital Object Identifier[:\s]*(?:https?://(?:dx\.)?doi\.org/)?(?P<text_label>10\.\d{4,}/[^\s<)"\']+)',
+        ]
+    ),
+    re.I,
+)
+
+# DOI meta tags read from the parsed page; the META_TAG_PATTERN scan is only used
+# when the page cannot be parsed
+META_DOI_XPATH = etree.XPath(
+    "//meta[re:test(@name, $names, 'i') or re:test(@property, $names, 'i')]/@content",
+    namespaces={"re": "http://exslt.org/regular-expressions"},
+    smart_strings=False,
+)
+META_DOI_NAMES = r"^(?:DC\.Identifier|citation_doi|dc\.identifier|doi|prism\.doi)"
+META_DOI_CONTENT = re.compile(r"10\.\d{4,}/[^\"'>\s]+", re.A)
+
+DOI_FORMAT = re.compile(r"^10\.\d{4,}/.+", re.A)
+META_DOI_TRAILING = re.compile(r'["\'/>\s]+$', re.A)
+TEXT_DOI_TRAILING = re.compile(r"[.,;)\]}\s]+$", re.A)
+
+# Quoted items of a stringified list of links, e.g. "['https://a', 'https://b']"
+LINK_ITEM_PATTERN = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+# Literals one of which must appear in the lowercased page for a pattern group to
+# match, checked with a plain substring search before running the regex
+META_DOI_PREFILTER = (b"<meta",)
+JSON_LD_DOI_PREFILTER = (b'"doi"', b'"@id"')
+TEXT_DOI_PREFILTER = (b"doi", b"digital object identifier")
+
+# Pooled HTTP session for pages that serve their DOI without JavaScript
+session = requests.Session()
+session.headers.update(
+    {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+)
+
+# At most this many pages of the same host are loaded at the same time
+HOST_CONCURRENCY = 2
+host_semaphores = defaultdict(lambda: threading.BoundedSemaphore(HOST_CONCURRENCY))
+host_semaphores_lock = threading.Lock()
+# Requests to the same host are spaced by at least this many seconds
+HOST_MIN_INTERVAL = 2.0
+host_next_request = {}
+host_next_request_lock = threading.Lock()
+
+# DOIs already looked up, keyed by normalized URL. Found DOIs are saved to
+# DOI_CACHE_FILE so later runs skip those links
+DOI_CACHE_FILE = "doi_cache.json"
+doi_cache: dict[str, str | None] = {}
+doi_cache_lock = threading.Lock()
+
+# One Firefox instance per thread, reused across links and closed at exit
+driver_local = threading.local()
+drivers = []
+drivers_lock = threading.Lock()
+
+
+def get_driver() -> webdriver.Firefox:
+    """
+    Return the Firefox WebDriver of the current thread, starting it on first use
+
+    Returns:
+        Firefox WebDriver instance
+    """
+    driver = getattr(driver_local, "driver", None)
+    if driver is None:
+        options = Options()
+        # DOI meta tags are in the initial DOM, so don't wait for subresources
+        options.page_load_strategy = "eager"
+        # options = webdriver.ChromeOptions()
+        # options.add_argument("--headless")  # optional: run in headless mode
+        driver = webdriver.Firefox(options=options)
+        driver_local.driver = driver
+        with drivers_lock:
+            drivers.append(driver)
+    return driver
+
+
+def discard_driver():
+    """
+    Quit the WebDriver of the current thread so the next call starts a new one
+    """
+    driver = getattr(driver_local, "driver", None)
+    if driver is not None:
+        driver_local.driver = None
+        with drivers_lock:
+            drivers.remove(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+
+def get_host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """
+    Return the semaphore limiting concurrent page loads for the host of a URL
+
+    Args:
+        url: URL about to be fetched
+
+    Returns:
+        Semaphore shared by every URL of the same host
+    """
+    with host_semaphores_lock:
+        return host_semaphores[urlparse(url).netloc]
+
+
+def wait_for_host(url: str):
+    """
+    Sleep until the host of a URL may be requested again, reserving the next slot
+
+    Args:
+        url: URL about to be fetched
+    """
+    host = urlparse(url).netloc
+    with host_next_request_lock:
+        now = time.monotonic()
+        slot = max(now, host_next_request.get(host, now))
+        host_next_request[host] = slot + HOST_MIN_INTERVAL
+    if slot > now:
+        time.sleep(slot - now)
+
+
+@atexit.register
+def quit_drivers():
+    """
+    Quit every WebDriver still running when the interpreter exits
+    """
+    with drivers_lock:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+        drivers.clear()
+
 
 def parse_links(x: str) -> list[str]:
     """
-    Parse a string representation of a list into an actual list.
+    Parse a '|'-separated string of links, or the string representation of a
+    list written by older get_scholar.py runs, into an actual list.
     If parsing fails, return an empty list.
 
     Args:
-        x (str): String representation of a list.
+        x (str): '|'-separated links or string representation of a list.
 
     Returns:
         list: Parsed list or empty list if parsing fails.
     """
+    if isinstance(x, str) and not x.lstrip().startswith("["):
+        return [link for link in x.split("|") if link]
     if isinstance(x, str):
         # Correct issue from double single quotes
         x = x.replace("''", "'")
-        try:
-            return ast.literal_eval(x)
-        except Exception:
-            return []
+        # Links are the quoted items of the list, single or double quoted as
+        # written by repr()
+        return [
+            single or double
+            for single, double in LINK_ITEM_PATTERN.findall(x)
+            if single or double
+        ]
     return []
 
 
-def get_doi_from_url(url: str, timeout: int = 10) -> str | None:
+def clean_links(links: list) -> list[str]:
     """
-    Improved DOI extraction function with better error handling
+    Keep only the stripped http(s) links of a parsed scholar_links list
 
     Args:
-        url: URL to extract DOI from
-        timeout: Timeout for HTTP requests in seconds
+        links: Parsed list of links
+
+    Returns:
+        List of stripped links starting with http
+    """
+    if not isinstance(links, list):
+        return []
+    return [
+        link.strip()
+        for link in links
+        if isinstance(link, str) and link.strip().startswith("http")
+    ]
+
+
+def find_meta_doi(html: str) -> str | None:
+    """
+    Find the DOI of the first DOI meta tag of a page
+
+    Args:
+        html: Page source to search
 
     Returns:
         Extracted DOI or None if not found
     """
     try:
-        # First, try to extract DOI directly from URL patterns (before making HTTP request)
-        url_patterns = [
-            # bioRxiv: https://www.biorxiv.org/content/10.1101/2021.09.19.460957.abstract
-            r"biorxiv\.org/content/(10\.1101/\d{4}\.\d{2}\.\d{2}\.\d{6})",
-            # OUP/Oxford: https://academic.oup.com/gigascience/article-abstract/doi/10.1093/gigascience/giac035/6575386
-            r"academic\.oup\.com/[^/]+/article[^/]*/doi/(10\.\d{4,}/[^/?&#]+)",
-            # Wiley: https://onlinelibrary.wiley.com/doi/abs/10.1111/tpj.16519
-            r"onlinelibrary\.wiley\.com/doi/(?:abs|full|pdf)?/?(?:10\.1001/)?(?:10\.1111/|10\.1002/)?(10\.\d{4,}/[^/?&#]+)",
-            # Nature: https://www.nature.com/articles/10.1038/s41586-021-03819-2
-            r"nature\.com/articles/(10\.\d{4,}/[^/?&#]+)",
-            # Springer: https://link.springer.com/article/10.1186/s12864-023-09185-9
-            r"link\.springer\.com/(?:article|chapter|book)/(10\.\d{4,}/[^/?&#]+)",
-            # Frontiers: https://www.frontiersin.org/articles/10.3389/fmicb.2021.685937/full
-            r"frontiersin\.org/articles/(10\.\d{4,}/[^/?&#]+)",
-            # BMC: https://bmcgenomics.biomedcentral.com/articles/10.1186/s12864-023-09185-9
-            r"biomedcentral\.com/articles/(10\.\d{4,}/[^/?&#]+)",
-            # Generic DOI in URL
-            r"(?:dx\.)?doi\.org/(10\.\d{4,}/[^/?&#]+)",
-            # Generic pattern for any URL containing DOI (moved to end as fallback)
-            r"/(?:doi/)?(?:abs/|full/|pdf/)?(10\.\d{4,}/[^/?&#\s\.]+)(?:\.[^/?&#]*)?",
-        ]
+        tree = lxml_html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        # Scan the raw source when lxml cannot parse it
+        for meta_tag in META_TAG_PATTERN.finditer(html):
+            tag = meta_tag.group()
+            if META_DOI_NAME_ATTR.search(tag):
+                doi_meta = META_DOI_CONTENT_ATTR.search(tag)
+                if doi_meta:
+                    return META_DOI_TRAILING.sub("", doi_meta.group(1))
+        return None
 
-        for pattern in url_patterns:
-            url_match = re.search(pattern, url, re.I)
-            if url_match:
-                potential_doi = url_match.group(1)
-                # Validate DOI format
-                if re.match(r"^10\.\d{4,}/.+", potential_doi):
-                    return potential_doi
-
-        # If no DOI found in URL, proceed with HTTP request
-        # headers = {
-        #     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        # }
-        # response = requests.get(url, headers=headers, timeout=timeout)
-        # response.raise_for_status()
+    for content in META_DOI_XPATH(tree, names=META_DOI_NAMES):
+        doi_match = META_DOI_CONTENT.search(content)
+        if doi_match:
+            return META_DOI_TRAILING.sub("", doi_match.group())
+    return None
 
-        options = Options()
-        # options = webdriver.ChromeOptions()
-        # options.add_argument("--headless")  # optional: run in headless mode
-        driver = webdriver.Firefox(options=options)
-        driver.implicitly_wait(10)
-        driver.set_page_load_timeout(timeout * randint(1, 2))
 
-        driver.get(url)
-        html = driver.page_source
-        driver.quit()
+def extract_doi_from_html(html: str) -> str | None:
+    """
+    Extract a DOI from the source of an article page
 
-        # Look for DOI in meta tags - comprehensive patterns
-        meta_patterns = [
-            r'<meta[^>]*(?:name|property)=["\']?(?:DC\.Identifier|citation_doi|dc\.identifier|doi|prism\.doi)["\']?[^>]*content=["\']?(10\.\d{4,}/[^"\'>\s]+)',
-            r'<meta[^>]*content=["\']?(10\.\d{4,}/[^"\'>\s]+)["\']?[^>]*(?:name|property)=["\']?(?:DC\.Identifier|citation_doi|dc\.identifier|doi)',
-        ]
-        for pattern in meta_patterns:
-            doi_meta = re.search(pattern, html, re.I)
-            if doi_meta:
-                doi = doi_meta.group(1)
-                doi = re.sub(r'["\'/>\s]+$', "", doi)
-                return doi
-
-        # Look for DOI in JSON-LD structured data
-        json_ld_patterns = [
-            r'"doi":\s*"(10\.\d{4,}/[^"]+)"',
-            r'"@id":\s*"(?:https?://(?:dx\.)?doi\.org/)?(10\.\d{4,}/[^"]+)"',
-        ]
-        for pattern in json_ld_patterns:
-            json_ld_doi = re.search(pattern, html, re.I)
-            if json_ld_doi:
-                return json_ld_doi.group(1)
-
-        # Look for DOI in text with various formats
-        text_patterns = [
-            r'doi[:\s]*(?:https?://(?:dx\.)?doi\.org/)?(10\.\d{4,}/[^\s<)"\']+)',
-            r'DOI[:\s]*(?:https?://(?:dx\.)?doi\.org/)?(10\.\d{4,}/[^\s<)"\']+)',
-            r'https?://(?:dx\.)?doi\.org/(10\.\d{4,}/[^\s<)"\']+)',
-            r'Digital Object Identifier[:\s]*(?:https?://(?:dx\.)?doi\.org/)?(10\.\d{4,}/[^\s<)"\']+)',
-        ]
-        for pattern in text_patterns:
-            match = re.search(pattern, html, re.I)
-            if match:
-                doi = match.group(1)
-                doi = re.sub(r"[.,;)\]}\s]+$", "", doi)
-                return doi
+    Args:
+        html: Page source to search
 
+    Returns:
+        Extracted DOI or None if not found
+    """
+    # Encode once; the prefilters and the JSON-LD and text patterns work on bytes
+    html_bytes = html.encode("utf-8", "replace")
+
+    # Every pattern needs a DOI prefix, so most pages without one end here
+    if b"10." not in html_bytes:
         return None
+    html_lower = html_bytes.lower()
+
+    # Look for DOI in meta tags - comprehensive patterns
+    if any(literal in html_lower for literal in META_DOI_PREFILTER):
+        doi = find_meta_doi(html)
+        if doi:
+            return doi
+
+    # Look for DOI in JSON-LD structured data
+    if any(literal in html_lower for literal in JSON_LD_DOI_PREFILTER):
+        json_ld_doi = JSON_LD_DOI_PATTERN.search(html_bytes)
+        if json_ld_doi:
+            return json_ld_doi.group(json_ld_doi.lastgroup).decode("utf-8", "replace")
+
+    # Look for DOI in text with various formats
+    if any(literal in html_lower for literal in TEXT_DOI_PREFILTER):
+        match = TEXT_DOI_PATTERN.search(html_bytes)
+        if match:
+            doi = match.group(match.lastgroup).decode("utf-8", "replace")
+            doi = TEXT_DOI_TRAILING.sub("", doi)
+            return doi
+
+    return None
+
+
+def get_doi_from_url(url: str, timeout: int = 10) -> str | None:
+    """
+    Improved DOI extraction function with better error handling
+
+    Args:
+        url: URL to extract DOI from
+        timeout: Timeout for HTTP requests in seconds
+
+    Returns:
+        Extracted DOI or None if not found
+    """
+    try:
+        # First, try to extract DOI directly from URL patterns (before making HTTP request)
+        url_match = URL_DOI_PATTERN.search(url)
+        if url_match:
+            potential_doi = url_match.group(url_match.lastgroup)
+            # Validate DOI format
+            if DOI_FORMAT.match(potential_doi):
+                return potential_doi
+
+        # Be respectful with requests: limit and space page loads per host
+        with get_host_semaphore(url):
+            # If no DOI found in URL, try a plain HTTP request first
+            try:
+                wait_for_host(url)
+                response = session.get(url, timeout=timeout)
+                if response.ok:
+                    doi = extract_doi_from_html(response.text)
+                    if doi:
+                        return doi
+            except requests.RequestException:
+                pass
+
+            # Fall back to the browser for pages that need JavaScript or block clients
+            driver = get_driver()
+            driver.set_page_load_timeout(timeout)
+
+            wait_for_host(url)
+            driver.get(url)
+            html = driver.page_source
+
+        return extract_doi_from_html(html)
     except TimeoutException:
         log_text.warning(f"Timeout for {url}")
         return "TIMEOUT"
     except WebDriverException as e:
         log_text.warning(f"Selenium WebDriver error for {url}: {e}")
+        discard_driver()
         return "WEBDRIVER_ERROR"
     except Exception as e:
         log_text.error(f"Unexpected error for {url}: {e}")
         return "ERROR"
 
 
-def process_scholar_links(links_list: pd.Series) -> list[dict]:
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so http/https and trailing-slash variants share a cache key
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Host, path and query of the URL
+    """
+    parsed = urlparse(url.strip())
+    key = f"{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+    if parsed.query:
+        key += f"?{parsed.query}"
+    return key
+
+
+def get_cached_doi(url: str) -> str | None:
+    """
+    Extract the DOI of a URL, reusing the result of earlier lookups of the same URL
+
+    Args:
+        url: URL to extract DOI from
+
+    Returns:
+        Extracted DOI, None if not found, or an error marker
+    """
+    key = normalize_url(url)
+    with doi_cache_lock:
+        if key in doi_cache:
+            return doi_cache[key]
+
+    doi = get_doi_from_url(url)
+
+    # Errors are not cached so the link is tried again
+    if doi not in ("TIMEOUT", "WEBDRIVER_ERROR", "ERROR"):
+        with doi_cache_lock:
+            doi_cache[key] = doi
+    return doi
+
+
+def load_doi_cache(cache_path: str):
+    """
+    Load the DOIs found in previous runs into the URL cache
+
+    Args:
+        cache_path: Path to the JSON file mapping normalized URLs to DOIs
+    """
+    if not os.path.exists(cache_path):
+        return
+    try:
+        with open(cache_path, "rb") as f:
+            cached = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        log_text.warning(f"Could not load DOI cache {cache_path}: {e}")
+        return
+    with doi_cache_lock:
+        doi_cache.update(cached)
+    log_text.info(f"Loaded {len(cached)} cached DOIs from {cache_path}")
+
+
+def save_doi_cache(cache_path: str):
+    """
+    Save the DOIs found so far, skipping links where none was found
+
+    Args:
+        cache_path: Path to the JSON file mapping normalized URLs to DOIs
+    """
+    with doi_cache_lock:
+        found = {key: doi for key, doi in doi_cache.items() if doi}
+    with open(cache_path, "wb") as f:
+        f.write(orjson.dumps(found, option=orjson.OPT_INDENT_2))
+
+
+def process_scholar_links(
+    links: list[str], executor: ThreadPoolExecutor | None = None
+) -> list[dict]:
     """
     Process scholar_links list and extract DOIs for each link
 
     Args:
-        links_list: Series of links (can be a single string or list of strings)
+        links: List of stripped http(s) links, as prepared by clean_links
+        executor: Optional thread pool used to look up the links concurrently
     Returns:
         List of dicts with link, doi, and status
     """
-    if pd.isna(links_list).any() or not links_list:
-        return []
-
-    # links_list = list(links_list)
-
-    # Handle both list and string inputs
-    if isinstance(links_list, str):
-        # If it's a string, split by common delimiters
-        links = re.split(r"[,;\n|]", links_list)
-        links = [link.strip() for link in links if link.strip()]
-    elif isinstance(links_list, list):
-        # If it's already a list, use directly
-        links = [
-            link.strip()
-            for link in links_list
-            if link and isinstance(link, str) and link.strip()
-        ]
-    else:
-        return []
+    lookup = executor.map if executor else map
 
     results = []
-    for link in links:
-        # log_text.info("================================")
-        # log_text.info(f"Processing link: {link}")
-        if link.startswith("http"):
-            doi = get_doi_from_url(link)
-            # log_text.info(f"Extracted DOI: {doi}")
-            results.append(
-                {
-                    "link": link,
-                    "doi": doi,
-                    "status": "success"
-                    if doi and not doi.startswith(("TIMEOUT", "REQUEST_ERROR", "ERROR"))
-                    else "failed",
-                }
-            )
-            # Be respectful with requests
-            time.sleep(randint(1, 3))
+    for link, doi in zip(links, lookup(get_cached_doi, links)):
+        # log_text.info(f"Extracted DOI for {link}: {doi}")
+        results.append(
+            {
+                "link": link,
+                "doi": doi,
+                "status": "success"
+                if doi and not doi.startswith(("TIMEOUT", "REQUEST_ERROR", "ERROR"))
+                else "failed",
+            }
+        )
 
     return results
 
 
-def process_json_articles(json_file_path: str) -> list[dict]:
+def process_json_articles(
+    json_file_path: str, executor: ThreadPoolExecutor | None = None
+) -> list[dict]:
     """
     Process JSON file with articles and extract DOIs
 
     Args:
         json_file_path: Path to the JSON file
+        executor: Optional thread pool used to look up the links concurrently
     Returns:
         List of dicts with bioproject_id, title, link, citations, doi, and status
     """
     try:
-        with open(json_file_path, "r") as f:
-            data = json.load(f)
+        with open(json_file_path, "rb") as f:
+            data = orjson.loads(f.read())
+
+        articles = [
+            article for article in data.get("articles", []) if article.get("link")
+        ]
+        lookup = executor.map if executor else map
+        dois = lookup(get_cached_doi, [article["link"] for article in articles])
 
         results = []
-        for article in data.get("articles", []):
-            link = article.get("link")
-            if link:
-                doi = get_doi_from_url(link)
-                result = {
-                    "bioproject_id": article.get("bioproject_id"),
-                    "title": article.get("title"),
-                    "link": link,
-                    "citations": article.get("citations"),
-                    "doi": doi,
-                    "status": "success"
-                    if doi and not doi.startswith(("TIMEOUT", "REQUEST_ERROR", "ERROR"))
-                    else "failed",
-                }
-                results.append(result)
-                time.sleep(randint(1, 3))  # Be respectful
+        for article, doi in zip(articles, dois):
+            result = {
+                "bioproject_id": article.get("bioproject_id"),
+                "title": article.get("title"),
+                "link": article["link"],
+                "citations": article.get("citations"),
+                "doi": doi,
+                "status": "success"
+                if doi and not doi.startswith(("TIMEOUT", "REQUEST_ERROR", "ERROR"))
+                else "failed",
+            }
+            results.append(result)
 
         return results
     except Exception as e:
@@ -266,7 +569,9 @@ def process_json_articles(json_file_path: str) -> list[dict]:
 
 
 def add_dois_to_dataframe(
-    df: pd.DataFrame, json_files_dict: dict[str, str] | None = None
+    df: pd.DataFrame,
+    json_files_dict: dict[str, str] | None = None,
+    max_workers: int = 8,
 ) -> pd.DataFrame:
     """
     Add DOI information to dataframe
@@ -274,6 +579,7 @@ def add_dois_to_dataframe(
     Args:
         df: DataFrame with 'scholar_links' column
         json_files_dict: Optional dict mapping bioproject_id to JSON file paths
+        max_workers: Number of links looked up concurrently
 
     Returns:
         DataFrame with added DOI information columns
@@ -289,39 +595,42 @@ def add_dois_to_dataframe(
         MofNCompleteColumn(),
     )
 
-    df_copy = df.copy()
+    total_tasks = len(df)
 
-    # Initialize new columns
-    df_copy["doi_results"] = None
-    df_copy["doi_count"] = 0
-    df_copy["failed_links"] = None
-    df_copy["success_rate"] = 0.0
+    # New columns are collected as lists and assigned once after the loop
+    doi_results_col = [None] * total_tasks
+    doi_count_col = [0] * total_tasks
+    failed_links_col = [None] * total_tasks
+    success_rate_col = [0.0] * total_tasks
 
-    total_tasks = len(df_copy)
+    has_scholar_links = "scholar_links" in df.columns
+    has_bioproject_id = "bioproject_id" in df.columns
+    rows = df.reindex(columns=["scholar_links", "bioproject_id"])
+    if has_scholar_links:
+        # Clean all link lists in one pass so the loop below only fetches links
+        rows["scholar_links"] = rows["scholar_links"].map(clean_links)
 
-    with progress:
+    with progress, ThreadPoolExecutor(max_workers=max_workers) as executor:
         task = progress.add_task("[cyan] Processing rows...", total=total_tasks)
-        for idx, row in df_copy.iterrows():
-            # log_text.info(f"Processing row {idx + 1}/{len(df_copy)}")
+        for pos, (scholar_links, bioproject_id) in enumerate(
+            rows.itertuples(index=False, name=None)
+        ):
+            # log_text.info(f"Processing row {pos + 1}/{total_tasks}")
 
             all_results = []
 
-            # if pd.notna(row['scholar_links']):
-            #     break
-
             # Process scholar_links
-            if (
-                "scholar_links" in df_copy.columns
-                and pd.notna(row["scholar_links"]).any()
-            ):
-                scholar_results = process_scholar_links(row["scholar_links"])
+            # Cleaned lists need no NaN probe, only an emptiness test
+            if has_scholar_links and scholar_links:
+                scholar_results = process_scholar_links(scholar_links, executor)
                 all_results.extend(scholar_results)
 
             # Process JSON file if available
-            if json_files_dict and "bioproject_id" in df_copy.columns:
-                bioproject_id = row["bioproject_id"]
+            if json_files_dict and has_bioproject_id:
                 if bioproject_id in json_files_dict:
-                    json_results = process_json_articles(json_files_dict[bioproject_id])
+                    json_results = process_json_articles(
+                        json_files_dict[bioproject_id], executor
+                    )
                     # Convert to same format as scholar_results
                     for result in json_results:
                         all_results.append(
@@ -336,26 +645,30 @@ def add_dois_to_dataframe(
 
             # Store results
             if all_results:
-                df_copy.at[idx, "doi_results"] = json.dumps(all_results)
+                doi_results_col[pos] = orjson.dumps(all_results).decode()
 
                 # Count successful DOIs
                 successful_dois = [r for r in all_results if r["status"] == "success"]
-                df_copy.at[idx, "doi_count"] = len(successful_dois)
+                doi_count_col[pos] = len(successful_dois)
 
                 # Store failed links for later processing
                 failed_links = [
                     r["link"] for r in all_results if r["status"] == "failed"
                 ]
                 if failed_links:
-                    df_copy.at[idx, "failed_links"] = json.dumps(failed_links)
+                    failed_links_col[pos] = orjson.dumps(failed_links).decode()
 
                 # Calculate success rate
-                if all_results:
-                    df_copy.at[idx, "success_rate"] = len(successful_dois) / len(
-                        all_results
-                    )
+                success_rate_col[pos] = len(successful_dois) / len(all_results)
             progress.update(task, advance=1)
-    return df_copy
+
+    # assign returns a new frame without deep-copying the input columns
+    return df.assign(
+        doi_results=doi_results_col,
+        doi_count=doi_count_col,
+        failed_links=failed_links_col,
+        success_rate=success_rate_col,
+    )
 
 
 def get_failed_links_for_reprocessing(df: pd.DataFrame) -> list[str]:
@@ -367,16 +680,16 @@ def get_failed_links_for_reprocessing(df: pd.DataFrame) -> list[str]:
     Returns:
         List of unique failed links
     """
-    failed_links = []
-    for _, row in df.iterrows():
-        if pd.notna(row["failed_links"]):
-            try:
-                links = json.loads(row["failed_links"])
-                failed_links.extend(links)
-            except json.JSONDecodeError:
-                continue
 
-    return list(set(failed_links))  # Remove duplicates
+    # Malformed values are skipped, as before
+    def load_links(value: str) -> list[str]:
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return []
+
+    links = df["failed_links"].dropna().map(load_links)
+    return list(dict.fromkeys(chain.from_iterable(links)))  # Remove duplicates
 
 
 def create_doi_summary_report(df: pd.DataFrame) -> dict:
@@ -433,17 +746,13 @@ if __name__ == "__main__":
 
     df["scholar_links"] = df["scholar_links"].apply(parse_links)
 
-    bioprojects = set(np.unique(df["BioProject"].dropna()))
-
-    # Optional: Define JSON files for specific bioprojects
-    json_path = args.json_dir
-    json_list = [name for name in os.listdir(json_path) if fnmatch(name, "*.json")]
-    json_set = set([name.split("_articles.json")[0] for name in json_list])
-
-    jsons_intersection = bioprojects.intersection(json_set)
+    bioprojects = set(df["BioProject"].dropna().unique())
 
+    # Optional: Define JSON files for specific bioprojects, in a single directory scan
     json_files = {
-        k: os.path.join(args.json_dir, f"{k}_articles.json") for k in jsons_intersection
+        path.name.removesuffix("_articles.json"): str(path)
+        for path in Path(args.json_dir).glob("*_articles.json")
+        if path.name.removesuffix("_articles.json") in bioprojects
     }
 
     # Filter dataframe to only those with scholar_processed = True
@@ -456,16 +765,18 @@ if __name__ == "__main__":
     # Keep only the first value for each bioproject
     df_filter = filtered_df.drop_duplicates(subset=["BioProject"], keep="first")
 
-    # Process the dataframe
+    # Process the dataframe, reusing DOIs found in previous runs
+    load_doi_cache(DOI_CACHE_FILE)
     df_with_dois = add_dois_to_dataframe(df_filter, json_files)
-
-    # Merge back DOI info into the full dataframe based on BioProject
-    df_merged = df.merge(
-        df_with_dois[
-            ["BioProject", "doi_count", "doi_results", "failed_links", "success_rate"]
-        ],
-        on="BioProject",
-        how="left",
+    save_doi_cache(DOI_CACHE_FILE)
+
+    # Merge back DOI info into the full dataframe based on BioProject, mapping
+    # each column through the one-row-per-BioProject lookup
+    lookup = df_with_dois.set_index("BioProject")[
+        ["doi_count", "doi_results", "failed_links", "success_rate"]
+    ]
+    df_merged = df.assign(
+        **{column: df["BioProject"].map(lookup[column]) for column in lookup.columns}
     )
 
     # Get summary report
@@ -483,5 +794,5 @@ if __name__ == "__main__":
     df_merged.to_csv(output_name, index=False)
 
     # Save failed links for later
-    with open("failed_links.json", "w") as f:
-        json.dump(failed_links, f, indent=2)
+    with open("failed_links.json", "wb") as f:
+        f.write(orjson.dumps(failed_links, option=orjson.OPT_INDENT_2))
@@ -1,29 +1,34 @@
 # /// script
 # requires-python = ">=3.10"
 # dependencies = [
-#     "regex",
+#     "brotli",
+#     "lxml",
+#     "orjson",
 #     "requests",
 #     "rich",
 #     "wiley-tdm",
 # ]
 # ///
 import argparse
-import json
+import io
 import logging
+import re
+import shutil
 import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from functools import wraps
+from functools import cached_property, lru_cache, wraps
 from pathlib import Path
-from random import randint
-from urllib.parse import parse_qs, unquote, urlparse
-from xml.etree import ElementTree as ET
+from urllib.parse import parse_qs, unquote, urlsplit
 
-import regex as re
+import orjson
 import requests
+from lxml import etree
+from requests.adapters import HTTPAdapter
 from rich.logging import RichHandler
-from wiley_tdm import TDMClient
+from urllib3.util.retry import Retry
 
 # Set up logging
 FORMAT = "%(message)s"
@@ -37,17 +42,251 @@ logging.basicConfig(
 log_text = logging.getLogger("rich")
 log_text.setLevel(20)
 
+# orjson always emits UTF-8, matching the previous ensure_ascii=False output
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Runs of whitespace, collapsed to one space in paragraph-level text
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# Characters of a DOI that are not safe in a file name
+UNSAFE_DOI_CHARS = re.compile(r"[^\w\-.]")
+# A complete DOI: "10." and a slash after the prefix (a bare prefix is incomplete),
+# excluding the incomplete Frontiers DOI "10.3389/fpls"
+VALID_DOI_PATTERN = re.compile(r"10\.(?!3389/fpls$)[^/]*/")
+# General DOI anywhere in the URL (stop at next slash, ? or #)
+URL_DOI_PATTERN = re.compile(r"(10\.\d{4,9}/[^/?#\s]+)", re.IGNORECASE)
+# DOI in the path of an /articles/ URL (e.g., Frontiers)
+ARTICLES_PATH_DOI_PATTERN = re.compile(r"/articles/(10\.\d{4,9}/[^/]+)", re.IGNORECASE)
+
+# Publisher and document type by DOI prefix (the part before the first slash)
+PUBLISHER_BY_DOI_PREFIX = {
+    "10.1101": ("biorxiv", "preprint"),
+    "10.1016": ("elsevier", "journal"),
+    "10.1006": ("elsevier", "journal"),
+    "10.1007": ("springer", "journal"),
+    "10.1038": ("springer", "journal"),
+    "10.1186": ("springer", "journal"),
+    "10.1002": ("wiley", "journal"),
+    "10.1111": ("wiley", "journal"),
+    "10.1371": ("plos", "journal"),
+    "10.3389": ("frontiers", "journal"),
+    "10.1094": ("aps", "journal"),
+    "10.1109": ("ieee", "journal"),
+}
+
+# Compiled XPath queries for the attribute lookups of Springer JATS articles
+ARTICLE_DOI_XPATH = etree.XPath('.//article-id[@pub-id-type="doi"]')
+AUTHOR_CONTRIB_XPATH = etree.XPath('.//contrib[@contrib-type="author"]')
+# Fields of one <contrib>, fetched in a single query: its first <name> with that
+# name's <surname> and <given-names>, its first <email> and its affiliation refs
+CONTRIB_FIELDS_XPATH = etree.XPath(
+    "(.//name)[1] | (.//name)[1]/surname | (.//name)[1]/given-names"
+    ' | (.//email)[1] | .//xref[@ref-type="aff"]'
+)
+FUNDING_INSTITUTION_XPATH = etree.XPath(".//funding-source//institution")
+
+# Namespaces of the Elsevier full-text API response
+ELSEVIER_NAMESPACES = {
+    "svapi": "http://www.elsevier.com/xml/svapi/article/dtd",
+    "ce": "http://www.elsevier.com/xml/common/dtd",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "prism": "http://prismstandard.org/namespaces/basic/2.0/",
+    "ja": "http://www.elsevier.com/xml/ja/dtd",
+    "xocs": "http://www.elsevier.com/xml/xocs/dtd",
+    "dcterms": "http://purl.org/dc/terms/",
+    "sb": "http://www.elsevier.com/xml/common/struct-bib/dtd",
+}
+
+# Compiled XPath queries for the repeated lookups of Elsevier articles, with the
+# namespace prefixes resolved once
+ELSEVIER_AUTHOR_XPATH = etree.XPath(
+    "ce:author-group[1]/ce:author", namespaces=ELSEVIER_NAMESPACES
+)
+ELSEVIER_CORRESPONDING_XPATH = etree.XPath(
+    'ce:cross-ref[@refid="cor0001"]', namespaces=ELSEVIER_NAMESPACES
+)
+ELSEVIER_AFFILIATION_XPATH = etree.XPath(
+    "ce:author-group[1]/ce:affiliation", namespaces=ELSEVIER_NAMESPACES
+)
+ELSEVIER_KEYWORD_XPATH = etree.XPath(
+    "ce:keywords[1]/ce:keyword/ce:text", namespaces=ELSEVIER_NAMESPACES
+)
+ELSEVIER_SECTION_XPATH = etree.XPath("ce:section", namespaces=ELSEVIER_NAMESPACES)
+ELSEVIER_PARA_XPATH = etree.XPath("ce:para", namespaces=ELSEVIER_NAMESPACES)
+ELSEVIER_BIB_REFERENCE_XPATH = etree.XPath(
+    "(.//ce:bibliography)[1]//ce:bib-reference", namespaces=ELSEVIER_NAMESPACES
+)
 
-class APIRateLimiter:
-    """Thread-safe API rate limiter with request counting and automatic sleep."""
+# Elements of a Springer <front> located in one walk, see ProcessSpringerXML.index_front
+FRONT_TAGS = (
+    "journal-meta",
+    "article-meta",
+    "article-title",
+    "contrib-group",
+    "aff",
+    "abstract",
+    "kwd-group",
+    "funding-group",
+)
+
+# Descendants of <journal-meta> and <aff> gathered in a single walk of each element,
+# by tag or by (tag, content-type)
+JOURNAL_META_KEYS = frozenset({"journal-title", "issn", "publisher-name"})
+AFFILIATION_KEYS = frozenset(
+    {
+        ("institution", "org-name"),
+        ("institution", "org-division"),
+        ("addr-line", "city"),
+        ("addr-line", "state"),
+        "country",
+    }
+)
+
+
+# Output directories already created in this run
+created_dirs: set[Path] = set()
+
+
+@lru_cache(maxsize=4)
+def load_api_keys(api_keys_file: str) -> dict:
+    """
+    Load the API keys file, once per path.
+
+    Args:
+        api_keys_file (str): Path of the API keys JSON file
+    Returns:
+        dict: API keys by service name
+    """
+    with open(api_keys_file, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def normalize_text(element: etree._Element | None) -> str:
+    """
+    Extract the text of a paragraph-level element with its whitespace collapsed.
+
+    The text fragments are concatenated as they appear, so inline markup such as
+    <sup> or <italic> does not add spaces. Containers whose children are not
+    separated by whitespace (e.g. a title followed by paragraphs) should use
+    extract_text_content instead.
+
+    Args:
+        element (etree._Element | None): The XML element.
+    Returns:
+        str: The normalized text content.
+    """
+    if element is None:
+        return ""
+    # Leaf elements (most paragraphs) hold all their text directly
+    if len(element) == 0:
+        return WHITESPACE_PATTERN.sub(" ", element.text or "").strip()
+
+    return WHITESPACE_PATTERN.sub(" ", "".join(element.itertext())).strip()
+
+
+def first_descendants(parent: etree._Element, keys: frozenset) -> dict:
+    """
+    Find the first descendant matching each key in one document-order walk.
+
+    Args:
+        parent (etree._Element): The element whose descendants are searched.
+        keys (frozenset): Tag names or (tag, content-type) pairs to look for.
+    Returns:
+        dict: The first matching element for each key that was found.
+    """
+    found = {}
+    for element in parent.iterdescendants():
+        for key in (element.tag, (element.tag, element.get("content-type"))):
+            if key in keys and key not in found:
+                found[key] = element
+        if len(found) == len(keys):
+            break
+    return found
+
+
+def create_session() -> requests.Session:
+    """
+    Create a requests session with a connection pool and retries on transient errors.
+
+    Returns:
+        requests.Session: Session shared by all publisher requests
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # Hand the last response back so the status checks below still apply
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces calls to a fixed rate."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens, i.e. the allowed burst.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
 
-    def __init__(self, request_limit: int = 450, sleep_duration: int = 90000):
+    def acquire(self):
+        """
+        Take one token, sleeping only as long as needed for it to be available.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# NCBI E-utilities allow 3 requests per second without an API key
+ncbi_limiter = TokenBucket(rate=3, capacity=3)
+# PMIDs sent to esummary in one request
+ESUMMARY_BATCH_SIZE = 200
+
+# A single pooled session keeps connections alive across DOIs, PMIDs and BioProjects
+http_session = create_session()
+
+
+class APIRateLimiter:
+    """Thread-safe API rate limiter with a sliding request window per API."""
+
+    def __init__(
+        self,
+        request_limit: int = 450,
+        sleep_duration: int = 90000,
+        max_concurrent: dict[str, int] | None = None,
+    ):
         """
         Initialize the rate limiter.
 
         Args:
-            request_limit: Maximum requests per API before triggering sleep
-            sleep_duration: Sleep duration in seconds when limit is reached
+            request_limit: Maximum requests per API within any window of sleep_duration
+            sleep_duration: Length in seconds of the window the limit applies to
+            max_concurrent: Maximum requests in flight per API
         """
         self.request_limit = request_limit
         self.sleep_duration = sleep_duration
@@ -61,6 +300,19 @@ class APIRateLimiter:
         }
         self._lock = threading.Lock()
         self._sleeping_apis = set()
+        # Start times of the requests still inside the window, oldest first
+        self._request_times = {api: deque() for api in self.download_counts}
+        # Waiters block on these until a slot frees up or the counts are reset
+        self._conditions = {
+            api: threading.Condition(self._lock) for api in self.download_counts
+        }
+
+        # Downloads run in a thread pool, so each API gets its own concurrency cap
+        max_concurrent = max_concurrent or {}
+        self._semaphores = {
+            api: threading.BoundedSemaphore(max_concurrent.get(api, 4))
+            for api in self.download_counts
+        }
 
     def track_request(self, api_name: str):
         """
@@ -73,64 +325,58 @@ class APIRateLimiter:
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
-                # Check if this API is currently sleeping
-                if api_name in self._sleeping_apis:
-                    log_text.info(
-                        f"{api_name} API is currently rate-limited, waiting..."
-                    )
-                    while api_name in self._sleeping_apis:
-                        time.sleep(10)  # Check every 10 seconds
-                        # Log message for every 5 minutes of waiting show past time, current count and how much time has passed and how much time is left
-                        if int(time.time()) % 300 == 0:
-                            with self._lock:
-                                current_count = self.download_counts[api_name]
+                request_times = self._request_times[api_name]
+                condition = self._conditions[api_name]
+                waiting_since = None
+                with condition:
+                    while True:
+                        now = time.monotonic()
+                        # Forget the requests that have left the window
+                        while (
+                            request_times
+                            and now - request_times[0] >= self.sleep_duration
+                        ):
+                            request_times.popleft()
+                        if len(request_times) < self.request_limit:
+                            break
+
+                        # The API is available again as soon as its oldest request
+                        # leaves the window, not a full window after the limit
+                        wait = request_times[0] + self.sleep_duration - now
+                        if waiting_since is None:
+                            waiting_since = now
+                            if api_name not in self._sleeping_apis:
+                                self._sleeping_apis.add(api_name)
+                                log_text.warning(
+                                    f"{api_name} has reached {self.request_limit} requests. "
+                                    f"Sleeping for {int(wait)} seconds..."
+                                )
+                            else:
+                                log_text.info(
+                                    f"{api_name} API is currently rate-limited, waiting..."
+                                )
+                        else:
+                            # Log a message for every 5 minutes of waiting
                             log_text.info(
-                                f"Still waiting for {api_name}. Current count: {current_count}. Time waited: {int(time.time()) % 300} seconds."
+                                f"Still waiting for {api_name}. Current count: {len(request_times)}. Time waited: {int(now - waiting_since)} seconds."
                             )
+                        condition.wait(timeout=min(wait, 300))
 
-                # Increment counter before making request
-                with self._lock:
-                    self.download_counts[api_name] += 1
-                    current_count = self.download_counts[api_name]
+                    # Count the request before making it. Every attempt counts
+                    # towards the limit, failed ones included.
+                    request_times.append(now)
+                    current_count = len(request_times)
+                    self.download_counts[api_name] = current_count
+                    woke_up = api_name in self._sleeping_apis
+                    self._sleeping_apis.discard(api_name)
 
-                    log_text.info(f"{api_name} request #{current_count}")
-
-                    # Check if we've reached the limit
-                    if current_count >= self.request_limit:
-                        self._sleeping_apis.add(api_name)
-                        log_text.warning(
-                            f"{api_name} has reached {self.request_limit} requests. "
-                            f"Sleeping for {self.sleep_duration} seconds..."
-                        )
-
-                        # Reset counter
-                        self.download_counts[api_name] = 0
-
-                        # Sleep in a separate thread to avoid blocking other APIs
-                        def sleep_and_wake():
-                            time.sleep(self.sleep_duration)
-                            with self._lock:
-                                if api_name in self._sleeping_apis:
-                                    self._sleeping_apis.remove(api_name)
-                                    log_text.info(
-                                        f"{api_name} API is now available again."
-                                    )
-
-                        threading.Thread(target=sleep_and_wake, daemon=True).start()
-
-                        # Block this request until sleep is over
-                        while api_name in self._sleeping_apis:
-                            time.sleep(1)
+                if woke_up:
+                    log_text.info(f"{api_name} API is now available again.")
+                log_text.info(f"{api_name} request #{current_count}")
 
                 # Execute the original function
-                try:
+                with self._semaphores[api_name]:
                     return func(*args, **kwargs)
-                except Exception as e:
-                    # If request failed, decrement counter
-                    with self._lock:
-                        if self.download_counts[api_name] > 0:
-                            self.download_counts[api_name] -= 1
-                    raise e
 
             return wrapper
 
@@ -145,84 +391,110 @@ class APIRateLimiter:
         """Manually reset count for a specific API."""
         with self._lock:
             self.download_counts[api_name] = 0
-            if api_name in self._sleeping_apis:
-                self._sleeping_apis.remove(api_name)
+            self._request_times[api_name].clear()
+            self._sleeping_apis.discard(api_name)
+            self._conditions[api_name].notify_all()
 
     def reset_all_counts(self):
         """Reset all API counts."""
         with self._lock:
             for api in self.download_counts:
                 self.download_counts[api] = 0
+                self._request_times[api].clear()
+                self._conditions[api].notify_all()
             self._sleeping_apis.clear()
 
 
 class ProcessSpringerXML:
-    def __init__(self, content: bytes):
+    def __init__(self, content: bytes | io.RawIOBase):
         """
         Initialize the ProcessSpringerXML with XML content.
 
         Args:
-            content (bytes): XML content as bytes.
+            content (bytes | io.RawIOBase): XML content as bytes, or a binary
+                stream such as the raw body of a streamed response.
         """
+        self.article = None
+        if isinstance(content, bytes):
+            content = io.BytesIO(content)
         try:
-            self.root = ET.fromstring(content)
-        except ET.ParseError as e:
+            # Stream the response and stop at the first <article>, so the rest of
+            # the records are never parsed. Comments and processing instructions
+            # are dropped as the stdlib parser did.
+            for _, element in etree.iterparse(
+                content,
+                events=("end",),
+                tag="article",
+                remove_comments=True,
+                remove_pis=True,
+            ):
+                self.article = element
+                break
+        except etree.XMLSyntaxError as e:
             log_text.error(f"Error parsing XML: {e}")
-            self.root = None
 
-    def extract_text_content(self, element: ET.Element) -> str:
+    def extract_text_content(self, element: etree._Element) -> str:
         """
         Extract all text content from an element, including nested text.
         """
         if element is None:
             return ""
+        # Leaf elements (most paragraphs and titles) hold all their text directly
+        if len(element) == 0:
+            return WHITESPACE_PATTERN.sub(" ", element.text or "").strip()
 
-        text_parts = []
-        if element.text:
-            text_parts.append(element.text.strip())
+        # itertext walks the subtree in C, in document order, without recursion;
+        # the fragments are space-separated and all whitespace collapsed in one pass
+        return WHITESPACE_PATTERN.sub(" ", " ".join(element.itertext())).strip()
 
-        for child in element:
-            child_text = self.extract_text_content(child)
-            if child_text:
-                text_parts.append(child_text)
-            if child.tail:
-                text_parts.append(child.tail.strip())
+    def index_front(self, front: etree._Element) -> dict:
+        """
+        Locate the elements read by the front extractors in a single walk.
 
-        return " ".join(part for part in text_parts if part)
+        Args:
+            front (etree._Element): The <front> element of the XML.
+        Returns:
+            dict: Lists of elements by tag (see FRONT_TAGS), in document order.
+        """
+        front_index = {tag: [] for tag in FRONT_TAGS}
+        for element in front.iter(*FRONT_TAGS):
+            front_index[element.tag].append(element)
+        return front_index
 
-    def extract_publication_info(self, front: ET.Element) -> dict:
+    def extract_publication_info(self, front_index: dict) -> dict:
         """
         Extract publication metadata.
 
         Args:
-            front (ET.Element): The <front> element of the XML.
+            front_index (dict): Elements of <front> by tag, from index_front.
         Returns:
             dict: A dictionary containing publication metadata fields.
         """
         pub_info = {}
 
         # Journal info
-        journal_meta = front.find(".//journal-meta")
+        journal_meta = next(iter(front_index["journal-meta"]), None)
         if journal_meta is not None:
-            journal_title = journal_meta.find(".//journal-title")
+            journal_fields = first_descendants(journal_meta, JOURNAL_META_KEYS)
+            journal_title = journal_fields.get("journal-title")
             if journal_title is not None:
                 pub_info["journal"] = journal_title.text
 
-            issn = journal_meta.find(".//issn")
+            issn = journal_fields.get("issn")
             if issn is not None:
                 pub_info["issn"] = issn.text
 
-            publisher = journal_meta.find(".//publisher-name")
+            publisher = journal_fields.get("publisher-name")
             if publisher is not None:
                 pub_info["publisher"] = publisher.text
 
         # Article metadata
-        article_meta = front.find(".//article-meta")
+        article_meta = next(iter(front_index["article-meta"]), None)
         if article_meta is not None:
             # DOI
-            doi = article_meta.find('.//article-id[@pub-id-type="doi"]')
-            if doi is not None:
-                pub_info["doi"] = doi.text
+            doi = ARTICLE_DOI_XPATH(article_meta)
+            if doi:
+                pub_info["doi"] = doi[0].text
 
             # Volume, issue
             volume = article_meta.find(".//volume")
@@ -234,20 +506,20 @@ class ProcessSpringerXML:
 
             # Publication dates
             pub_dates = {}
-            for pub_date in article_meta.findall(".//pub-date"):
+            for pub_date in article_meta.iter("pub-date"):
                 date_type = pub_date.get("date-type")
                 day = pub_date.find("day")
                 month = pub_date.find("month")
                 year = pub_date.find("year")
 
                 if year is not None:
+                    # Extend the date one component at a time instead of
+                    # rebuilding it for every level of precision
                     date_str = year.text
                     if month is not None:
-                        date_str = f"{year.text}-{month.text.zfill(2)}"
+                        date_str = f"{date_str}-{month.text.zfill(2)}"
                         if day is not None:
-                            date_str = (
-                                f"{year.text}-{month.text.zfill(2)}-{day.text.zfill(2)}"
-                            )
+                            date_str = f"{date_str}-{day.text.zfill(2)}"
 
                     pub_dates[date_type] = date_str
 
@@ -256,7 +528,7 @@ class ProcessSpringerXML:
 
         return pub_info
 
-    def extract_authors(self, contrib_group: ET.Element) -> list:
+    def extract_authors(self, contrib_group: etree._Element) -> list:
         """
         Extract author information in a structured format.
         """
@@ -264,14 +536,22 @@ class ProcessSpringerXML:
             return []
 
         authors = []
-        for contrib in contrib_group.findall('.//contrib[@contrib-type="author"]'):
+        for contrib in AUTHOR_CONTRIB_XPATH(contrib_group):
             author = {}
 
+            # Bucket the contrib fields by tag, keeping the first of each
+            fields = {}
+            aff_refs = []
+            for element in CONTRIB_FIELDS_XPATH(contrib):
+                if element.tag == "xref":
+                    aff_refs.append(element.get("rid"))
+                else:
+                    fields.setdefault(element.tag, element)
+
             # Basic info
-            name_elem = contrib.find(".//name")
-            if name_elem is not None:
-                surname = name_elem.find("surname")
-                given_names = name_elem.find("given-names")
+            if "name" in fields:
+                surname = fields.get("surname")
+                given_names = fields.get("given-names")
                 author["surname"] = surname.text if surname is not None else ""
                 author["given_names"] = (
                     given_names.text if given_names is not None else ""
@@ -281,7 +561,7 @@ class ProcessSpringerXML:
                 )
 
             # Email
-            email_elem = contrib.find(".//email")
+            email_elem = fields.get("email")
             if email_elem is not None:
                 author["email"] = email_elem.text
 
@@ -289,44 +569,42 @@ class ProcessSpringerXML:
             author["is_corresponding"] = contrib.get("corresp") == "yes"
 
             # Affiliations (reference IDs)
-            aff_refs = [
-                xref.get("rid") for xref in contrib.findall('.//xref[@ref-type="aff"]')
-            ]
             author["affiliation_refs"] = aff_refs
 
             authors.append(author)
 
         return authors
 
-    def extract_affiliations(self, front: ET.Element) -> dict:
+    def extract_affiliations(self, front_index: dict) -> dict:
         """
         Extract affiliation information.
         Args:
-            front (ET.Element): The <front> element of the XML.
+            front_index (dict): Elements of <front> by tag, from index_front.
         Returns:
             dict: A dictionary mapping affiliation IDs to their details.
         """
         affiliations = {}
 
-        for aff in front.findall(".//aff"):
+        for aff in front_index["aff"]:
             aff_id = aff.get("id")
             if aff_id:
                 affiliation = {}
+                aff_fields = first_descendants(aff, AFFILIATION_KEYS)
 
                 # Institution name
-                institution = aff.find('.//institution[@content-type="org-name"]')
+                institution = aff_fields.get(("institution", "org-name"))
                 if institution is not None:
                     affiliation["institution"] = institution.text
 
                 # Department/Division
-                division = aff.find('.//institution[@content-type="org-division"]')
+                division = aff_fields.get(("institution", "org-division"))
                 if division is not None:
                     affiliation["department"] = division.text
 
                 # Address
-                city = aff.find('.//addr-line[@content-type="city"]')
-                state = aff.find('.//addr-line[@content-type="state"]')
-                country = aff.find(".//country")
+                city = aff_fields.get(("addr-line", "city"))
+                state = aff_fields.get(("addr-line", "state"))
+                country = aff_fields.get("country")
 
                 address = {}
                 if city is not None:
@@ -343,15 +621,15 @@ class ProcessSpringerXML:
 
         return affiliations
 
-    def extract_abstract(self, front: ET.Element) -> dict:
+    def extract_abstract(self, front_index: dict) -> dict:
         """
         Extract structured abstract content.
         Args:
-            front (ET.Element): The <front> element of the XML.
+            front_index (dict): Elements of <front> by tag, from index_front.
         Returns:
             dict: A dictionary containing abstract sections and full text.
         """
-        abstract_elem = front.find(".//abstract")
+        abstract_elem = next(iter(front_index["abstract"]), None)
         if abstract_elem is None:
             return {}
 
@@ -359,14 +637,14 @@ class ProcessSpringerXML:
 
         # Abstract sections
         sections = {}
-        for sec in abstract_elem.findall(".//sec"):
+        for sec in abstract_elem.iter("sec"):
             title_elem = sec.find("title")
             if title_elem is not None:
                 section_title = title_elem.text.lower()
                 section_content = []
 
-                for p in sec.findall(".//p"):
-                    paragraph_text = self.extract_text_content(p)
+                for p in sec.iter("p"):
+                    paragraph_text = normalize_text(p)
                     if paragraph_text:
                         section_content.append(paragraph_text)
 
@@ -380,20 +658,20 @@ class ProcessSpringerXML:
 
         return abstract
 
-    def extract_keywords(self, front: ET.Element) -> list:
+    def extract_keywords(self, front_index: dict) -> list:
         """
         Extract keywords from the article.
         Args:
-            front (ET.Element): The <front> element of the XML.
+            front_index (dict): Elements of <front> by tag, from index_front.
         Returns:
             list: A list of keywords with their language if available.
         """
         keywords = []
 
-        for kwd_group in front.findall(".//kwd-group"):
+        for kwd_group in front_index["kwd-group"]:
             group_keywords = []
-            for kwd in kwd_group.findall(".//kwd"):
-                keyword_text = self.extract_text_content(kwd)
+            for kwd in kwd_group.iter("kwd"):
+                keyword_text = normalize_text(kwd)
                 if keyword_text:
                     group_keywords.append(keyword_text)
 
@@ -403,26 +681,26 @@ class ProcessSpringerXML:
 
         return keywords
 
-    def extract_funding(self, front: ET.Element) -> list:
+    def extract_funding(self, front_index: dict) -> list:
         """
         Extract funding information.
         Args:
-            front (ET.Element): The <front> element of the XML.
+            front_index (dict): Elements of <front> by tag, from index_front.
         Returns:
             list: A list of funding sources and award IDs.
         """
-        funding_group = front.find(".//funding-group")
+        funding_group = next(iter(front_index["funding-group"]), None)
         if funding_group is None:
             return []
 
         funding_info = []
-        for award_group in funding_group.findall(".//award-group"):
+        for award_group in funding_group.iter("award-group"):
             funding = {}
 
             # Funding source
-            funding_source = award_group.find(".//funding-source//institution")
-            if funding_source is not None:
-                funding["source"] = funding_source.text
+            funding_source = FUNDING_INSTITUTION_XPATH(award_group)
+            if funding_source:
+                funding["source"] = funding_source[0].text
 
             # Award ID
             award_id = award_group.find(".//award-id")
@@ -433,65 +711,77 @@ class ProcessSpringerXML:
 
         return funding_info
 
-    def extract_body_content(self, body: ET.Element) -> dict:
+    def _collect_section_children(
+        self, element: etree._Element, paragraphs: list | None, subsections: list
+    ):
         """
-        Extract the main body content in a structured way.
+        Walk the descendants of a section once, in document order, stopping at
+        nested sections, which become subsections.
+
         Args:
-            body (ET.Element): The <body> element of the XML.
-        Returns:
-            dict: A dictionary containing sections, subsections, and full text.
+            element (etree._Element): The element whose children are walked.
+            paragraphs (list | None): Receives the paragraphs, or None to skip them.
+            subsections (list): Receives the nested sections.
         """
-        if body is None:
-            return {}
-
-        content = {}
-        sections = []
+        for child in element:
+            if child.tag == "sec":
+                subsections.append(self._recursive_section_extract(child))
+            elif child.tag == "p":
+                if paragraphs is not None:
+                    para_text = normalize_text(child)
+                    if para_text:
+                        paragraphs.append(
+                            {"id": child.get("id", ""), "text": para_text}
+                        )
+            else:
+                # Paragraphs inside figures, lists, boxes, etc. belong to this section
+                self._collect_section_children(child, paragraphs, subsections)
 
-        for sec in body.findall(".//sec"):
-            section = {}
+    def _recursive_section_extract(self, section_element: etree._Element) -> dict:
+        """
+        Extract a section with its own paragraphs and, recursively, its subsections.
 
-            # Section ID and title
-            section["id"] = sec.get("id", "")
-            title_elem = sec.find("title")
-            if title_elem is not None:
-                section["title"] = title_elem.text
+        Args:
+            section_element (etree._Element): The <sec> element.
+        Returns:
+            dict: A dictionary representing the section and its subsections.
+        """
+        section = {}
 
-            # Section content (paragraphs)
-            paragraphs = []
-            for p in sec.findall(".//p"):
-                para_text = self.extract_text_content(p)
-                if para_text:
-                    paragraphs.append({"id": p.get("id", ""), "text": para_text})
+        # Section ID and title
+        section["id"] = section_element.get("id", "")
+        title_elem = section_element.find("title")
+        if title_elem is not None:
+            section["title"] = title_elem.text
 
-            if paragraphs:
-                section["paragraphs"] = paragraphs
+        # Each paragraph is listed once, under the innermost section holding it
+        paragraphs = []
+        subsections = []
+        self._collect_section_children(section_element, paragraphs, subsections)
 
-            # Subsections
-            subsections = []
-            for subsec in sec.findall("./sec"):  # Direct child sections only
-                subsection = {}
-                subsection["id"] = subsec.get("id", "")
-                sub_title = subsec.find("title")
-                if sub_title is not None:
-                    subsection["title"] = sub_title.text
-
-                sub_paragraphs = []
-                for p in subsec.findall(".//p"):
-                    para_text = self.extract_text_content(p)
-                    if para_text:
-                        sub_paragraphs.append(
-                            {"id": p.get("id", ""), "text": para_text}
-                        )
+        if paragraphs:
+            section["paragraphs"] = paragraphs
+        if subsections:
+            section["subsections"] = subsections
 
-                if sub_paragraphs:
-                    subsection["paragraphs"] = sub_paragraphs
+        return section
 
-                subsections.append(subsection)
+    def extract_body_content(self, body: etree._Element) -> dict:
+        """
+        Extract the main body content in a structured way.
+        Args:
+            body (etree._Element): The <body> element of the XML.
+        Returns:
+            dict: A dictionary containing sections, subsections, and full text.
+        """
+        if body is None:
+            return {}
 
-            if subsections:
-                section["subsections"] = subsections
+        content = {}
+        sections = []
 
-            sections.append(section)
+        # Top-level sections only; nested ones are reached through their parents
+        self._collect_section_children(body, None, sections)
 
         content["sections"] = sections
         content["full_text"] = self.extract_text_content(body)
@@ -505,7 +795,7 @@ class ProcessSpringerXML:
         Returns:
             dict: A dictionary containing metadata fields in a structured form.
         """
-        article_element = self.root.find(".//article")
+        article_element = self.article
         if article_element is None:
             return log_text.error("No <article> element found in XML.")
 
@@ -526,29 +816,32 @@ class ProcessSpringerXML:
         }
 
         if front is not None:
+            # Walk <front> once; the extractors below read from the index
+            front_index = self.index_front(front)
+
             # Publication information
             structured_article["publication_info"] = self.extract_publication_info(
-                front
+                front_index
             )
 
             # Title
-            title_elem = front.find(".//article-title")
+            title_elem = next(iter(front_index["article-title"]), None)
             if title_elem is not None:
-                structured_article["title"] = self.extract_text_content(title_elem)
+                structured_article["title"] = normalize_text(title_elem)
 
             # Authors and affiliations
-            contrib_group = front.find(".//contrib-group")
+            contrib_group = next(iter(front_index["contrib-group"]), None)
             structured_article["authors"] = self.extract_authors(contrib_group)
-            structured_article["affiliations"] = self.extract_affiliations(front)
+            structured_article["affiliations"] = self.extract_affiliations(front_index)
 
             # Abstract
-            structured_article["abstract"] = self.extract_abstract(front)
+            structured_article["abstract"] = self.extract_abstract(front_index)
 
             # Keywords
-            structured_article["keywords"] = self.extract_keywords(front)
+            structured_article["keywords"] = self.extract_keywords(front_index)
 
             # Funding
-            structured_article["funding"] = self.extract_funding(front)
+            structured_article["funding"] = self.extract_funding(front_index)
 
         # Body content
         if body is not None:
@@ -558,7 +851,9 @@ class ProcessSpringerXML:
         if back is not None:
             ref_list = back.find(".//ref-list")
             if ref_list is not None:
-                structured_article["references_count"] = len(ref_list.findall(".//ref"))
+                structured_article["references_count"] = sum(
+                    1 for _ in ref_list.iter("ref")
+                )
 
         return structured_article
 
@@ -573,51 +868,37 @@ class ProcessElsevierXML:
         """
         try:
             # Register namespaces to handle prefixed tags and the default namespace
-            self.namespaces = {
-                "svapi": "http://www.elsevier.com/xml/svapi/article/dtd",
-                "ce": "http://www.elsevier.com/xml/common/dtd",
-                "dc": "http://purl.org/dc/elements/1.1/",
-                "prism": "http://prismstandard.org/namespaces/basic/2.0/",
-                "ja": "http://www.elsevier.com/xml/ja/dtd",
-                "xocs": "http://www.elsevier.com/xml/xocs/dtd",
-                "dcterms": "http://purl.org/dc/terms/",
-                "sb": "http://www.elsevier.com/xml/common/struct-bib/dtd",
-            }
-            self.root = ET.fromstring(content)
-        except ET.ParseError as e:
+            self.namespaces = ELSEVIER_NAMESPACES
+            # Comments and processing instructions are dropped as the stdlib
+            # parser did, so they never show up in the extracted text
+            parser = etree.XMLParser(remove_comments=True, remove_pis=True)
+            self.root = etree.fromstring(content, parser)
+        except etree.XMLSyntaxError as e:
             log_text.error(f"Error parsing XML: {e}")
             self.root = None
 
-    def extract_text_content(self, element: ET.Element) -> str:
+    def extract_text_content(self, element: etree._Element) -> str:
         """
         Extract all text content from an element, including nested text.
 
         Args:
-            element (ET.Element): The XML element to extract text from.
+            element (etree._Element): The XML element to extract text from.
         Returns:
             str: The extracted text content.
         """
         if element is None:
             return ""
+        # Leaf elements hold all their text directly
+        if len(element) == 0:
+            return WHITESPACE_PATTERN.sub(" ", element.text or "").strip()
 
-        text_parts = []
-        if element.text:
-            text_parts.append(element.text.strip())
-
-        for child in element:
-            child_text = self.extract_text_content(child)
-            if child_text:
-                text_parts.append(child_text)
-            if child.tail:
-                text_parts.append(child.tail.strip())
-
-        return " ".join(part for part in text_parts if part)
+        return WHITESPACE_PATTERN.sub(" ", " ".join(element.itertext())).strip()
 
-    def extract_publication_info(self, coredata: ET.Element) -> dict:
+    def extract_publication_info(self, coredata: etree._Element) -> dict:
         """
         Extract publication metadata from the <coredata> element.
         Args:
-            coredata (ET.Element): The <coredata> element of the XML.
+            coredata (etree._Element): The <coredata> element of the XML.
         Returns:
             dict: A dictionary containing publication metadata fields.
         """
@@ -642,38 +923,32 @@ class ProcessElsevierXML:
 
         return pub_info
 
-    def extract_authors(self, head: ET.Element, coredata: ET.Element) -> list:
+    def extract_authors(self, head: etree._Element, coredata: etree._Element) -> list:
         """
         Extract author information from the <head> element, with a fallback to <coredata>.
         Args:
-            head (ET.Element): The <head> element of the XML.
-            coredata (ET.Element): The <coredata> element of the XML.
+            head (etree._Element): The <head> element of the XML.
+            coredata (etree._Element): The <coredata> element of the XML.
         Returns:
             list: A list of authors with their details.
         """
         authors = []
         if head is not None:
             # Primary method: structured author data
-            author_group = head.find("ce:author-group", self.namespaces)
-            if author_group is not None:
-                for author_elem in author_group.findall("ce:author", self.namespaces):
-                    author = {}
-                    given_name = author_elem.findtext(
-                        "ce:given-name", namespaces=self.namespaces
-                    )
-                    surname = author_elem.findtext(
-                        "ce:surname", namespaces=self.namespaces
-                    )
-                    author["given_names"] = given_name if given_name else ""
-                    author["surname"] = surname if surname else ""
-                    author["full_name"] = f"{given_name} {surname}".strip()
-
-                    corr_ref = author_elem.find(
-                        'ce:cross-ref[@refid="cor0001"]', self.namespaces
-                    )
-                    author["is_corresponding"] = corr_ref is not None
-
-                    authors.append(author)
+            for author_elem in ELSEVIER_AUTHOR_XPATH(head):
+                author = {}
+                given_name = author_elem.findtext(
+                    "ce:given-name", namespaces=self.namespaces
+                )
+                surname = author_elem.findtext("ce:surname", namespaces=self.namespaces)
+                author["given_names"] = given_name if given_name else ""
+                author["surname"] = surname if surname else ""
+                author["full_name"] = f"{given_name} {surname}".strip()
+                author["is_corresponding"] = bool(
+                    ELSEVIER_CORRESPONDING_XPATH(author_elem)
+                )
+
+                authors.append(author)
 
         # Fallback method: simple author list from coredata
         if not authors and coredata is not None:
@@ -682,11 +957,11 @@ class ProcessElsevierXML:
 
         return authors
 
-    def extract_affiliations(self, head: ET.Element) -> dict:
+    def extract_affiliations(self, head: etree._Element) -> dict:
         """
         Extract affiliation information from the <head> element.
         Args:
-            head (ET.Element): The <head> element of the XML.
+            head (etree._Element): The <head> element of the XML.
         Returns:
             dict: A dictionary mapping affiliation IDs to their details.
         """
@@ -694,21 +969,19 @@ class ProcessElsevierXML:
         if head is None:
             return affiliations
 
-        author_group = head.find("ce:author-group", self.namespaces)
-        if author_group is not None:
-            for aff_elem in author_group.findall("ce:affiliation", self.namespaces):
-                aff_id = aff_elem.get("id")
-                if aff_id:
-                    affiliations[aff_id] = self.extract_text_content(
-                        aff_elem.find("ce:textfn", self.namespaces)
-                    )
+        for aff_elem in ELSEVIER_AFFILIATION_XPATH(head):
+            aff_id = aff_elem.get("id")
+            if aff_id:
+                affiliations[aff_id] = normalize_text(
+                    aff_elem.find("ce:textfn", self.namespaces)
+                )
         return affiliations
 
-    def extract_abstract(self, head: ET.Element) -> dict:
+    def extract_abstract(self, head: etree._Element) -> dict:
         """
         Extract abstract content from the <head> element.
         Args:
-            head (ET.Element): The <head> element of the XML.
+            head (etree._Element): The <head> element of the XML.
         Returns:
             dict: A dictionary containing abstract sections and full text.
         """
@@ -720,21 +993,19 @@ class ProcessElsevierXML:
 
         return {"full_text": self.extract_text_content(abstract_elem)}
 
-    def extract_keywords(self, head: ET.Element, coredata: ET.Element) -> list:
+    def extract_keywords(self, head: etree._Element, coredata: etree._Element) -> list:
         """
         Extract keywords from <head> with a fallback to <coredata>.
         Args:
-            head (ET.Element): The <head> element of the XML.
-            coredata (ET.Element): The <coredata> element of the XML.
+            head (etree._Element): The <head> element of the XML.
+            coredata (etree._Element): The <coredata> element of the XML.
         Returns:
             list: A list of keywords.
         """
         keywords = []
         if head is not None:
-            kwd_group = head.find("ce:keywords", self.namespaces)
-            if kwd_group is not None:
-                for kwd in kwd_group.findall("ce:keyword/ce:text", self.namespaces):
-                    keywords.append(self.extract_text_content(kwd))
+            for kwd in ELSEVIER_KEYWORD_XPATH(head):
+                keywords.append(normalize_text(kwd))
 
         if not keywords and coredata is not None:
             for subject in coredata.findall("dcterms:subject", self.namespaces):
@@ -743,42 +1014,49 @@ class ProcessElsevierXML:
 
         return keywords
 
-    def _recursive_section_extract(self, section_element: ET.Element) -> dict:
+    def _recursive_section_extract(self, section_element: etree._Element) -> dict:
         """
-        Helper function to recursively extract sections and subsections.
+        Helper function to extract a section and all its nested subsections.
 
         Args:
-            section_element (ET.Element): The section XML element.
+            section_element (etree._Element): The section XML element.
         Returns:
             dict: A dictionary representing the section and its subsections.
         """
-        section_data = {}
-        title_elem = section_element.find("ce:section-title", self.namespaces)
-        if title_elem is not None:
-            section_data["title"] = self.extract_text_content(title_elem)
+        root_data = {}
+        # Walk the nested sections with an explicit stack instead of recursion;
+        # each entry pairs a section element with the dict it fills in
+        stack = [(section_element, root_data)]
+        while stack:
+            element, section_data = stack.pop()
+            title_elem = element.find("ce:section-title", self.namespaces)
+            if title_elem is not None:
+                section_data["title"] = normalize_text(title_elem)
 
-        # Extract paragraphs directly under this section
-        section_data["paragraphs"] = [
-            self.extract_text_content(p)
-            for p in section_element.findall("ce:para", self.namespaces)
-        ]
+            # Extract paragraphs directly under this section
+            section_data["paragraphs"] = [
+                normalize_text(p) for p in ELSEVIER_PARA_XPATH(element)
+            ]
 
-        # Recursively find subsections
-        subsections = []
-        for subsec_elem in section_element.findall("ce:section", self.namespaces):
-            subsections.append(self._recursive_section_extract(subsec_elem))
+            # Queue the subsections; their dicts are listed in document order now
+            # and filled in when they are popped
+            subsections = []
+            for subsec_elem in ELSEVIER_SECTION_XPATH(element):
+                subsection_data = {}
+                subsections.append(subsection_data)
+                stack.append((subsec_elem, subsection_data))
 
-        if subsections:
-            section_data["subsections"] = subsections
+            if subsections:
+                section_data["subsections"] = subsections
 
-        return section_data
+        return root_data
 
-    def extract_body_content(self, body: ET.Element) -> dict:
+    def extract_body_content(self, body: etree._Element) -> dict:
         """
         Extract the main body content recursively.
 
         Args:
-            body (ET.Element): The <body> element of the XML.
+            body (etree._Element): The <body> element of the XML.
         Returns:
             dict: A dictionary containing sections, subsections, and full text.
         """
@@ -790,7 +1068,7 @@ class ProcessElsevierXML:
 
         sections_container = body.find("ce:sections", self.namespaces)
         if sections_container is not None:
-            for sec in sections_container.findall("ce:section", self.namespaces):
+            for sec in ELSEVIER_SECTION_XPATH(sections_container):
                 sections.append(self._recursive_section_extract(sec))
 
         content["sections"] = sections
@@ -798,11 +1076,11 @@ class ProcessElsevierXML:
 
         return content
 
-    def extract_references(self, tail: ET.Element) -> list:
+    def extract_references(self, tail: etree._Element) -> list:
         """
         Extract bibliographic references from the <tail> element.
         Args:
-            tail (ET.Element): The <tail> element of the XML.
+            tail (etree._Element): The <tail> element of the XML.
         Returns:
             list: A list of references in text form.
         """
@@ -810,16 +1088,14 @@ class ProcessElsevierXML:
             return []
 
         references = []
-        bib_section = tail.find(".//ce:bibliography", self.namespaces)
-        if bib_section is not None:
-            for ref_elem in bib_section.findall(".//ce:bib-reference", self.namespaces):
-                ref_text = ref_elem.find("ce:source-text", self.namespaces)
-                if ref_text is not None and ref_text.text:
-                    references.append(ref_text.text.strip())
-                else:  # Fallback for a different structure
-                    ref_text = self.extract_text_content(ref_elem)
-                    if ref_text:
-                        references.append(ref_text)
+        for ref_elem in ELSEVIER_BIB_REFERENCE_XPATH(tail):
+            ref_text = ref_elem.find("ce:source-text", self.namespaces)
+            if ref_text is not None and ref_text.text:
+                references.append(ref_text.text.strip())
+            else:  # Fallback for a different structure
+                ref_text = self.extract_text_content(ref_elem)
+                if ref_text:
+                    references.append(ref_text)
         return references
 
     def extract_metadata(self) -> dict:
@@ -880,7 +1156,9 @@ class APSDownloader:
         Initialize the APSDownloader with a requests session.
 
         """
-        self.session = requests.Session()
+        # Its own pooled session, since the browser-like headers and the APS
+        # cookies should not leak into the publisher API requests
+        self.session = create_session()
 
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -899,7 +1177,7 @@ class APSDownloader:
         Args:
             doi (str): Document DOI.
         Returns:
-            tuple: (pdf_content as bytes or None, error message or None)
+            tuple: (streamed PDF response or None, error message or None)
         """
         abstract_url = f"https://apsjournals.apsnet.org/doi/{doi}"
         pdf_url = f"https://apsjournals.apsnet.org/doi/pdf/{doi}"
@@ -911,16 +1189,22 @@ class APSDownloader:
             # Request the PDF with the Referer header. The session already has the main headers (like User-Agent).  We add the specific Referer for this one request.
             pdf_request_headers = {"Referer": abstract_url}
 
+            # The body is left unread so download_txt can stream it to disk
             response = self.session.get(
-                pdf_url, headers=pdf_request_headers, timeout=30, allow_redirects=True
+                pdf_url,
+                headers=pdf_request_headers,
+                timeout=30,
+                allow_redirects=True,
+                stream=True,
             )
 
             if (
                 response.status_code == 200
                 and "application/pdf" in response.headers.get("Content-Type", "")
             ):
-                return response.content, None
+                return response, None
             else:
+                response.close()
                 return (
                     None,
                     f"Failed to download PDF. Status: {response.status_code}, URL: {pdf_url}",
@@ -931,7 +1215,13 @@ class APSDownloader:
 
 
 class TXTDownloader:
-    _rate_limiter = APIRateLimiter(request_limit=450, sleep_duration=90000)
+    _rate_limiter = APIRateLimiter(
+        request_limit=450,
+        sleep_duration=90000,
+        max_concurrent={"springer": 4, "wiley": 2, "aps": 2, "unpaywall": 8},
+    )
+    _session = http_session
+
     def __init__(self, api_keys_file: str, email: str, output_dir: str, file_name: str):
         """
         Initialize the TXTDownloader with API keys, email, and output directory.
@@ -942,17 +1232,16 @@ class TXTDownloader:
             output_dir (str): Directory to save downloaded TXT files.
         """
         self.email = email
-        self.output_dir = Path(output_dir)
-        self.output_dir = output_dir / "files" / file_name
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir = Path(output_dir) / "files" / file_name
+        if self.output_dir not in created_dirs:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(self.output_dir)
 
         # Load API keys
-        with open(api_keys_file, "r") as f:
-            self.api_keys = json.load(f)
+        self.api_keys = load_api_keys(api_keys_file)
+
+        self.session = self._session
 
-        self.session = requests.Session()
-    
-        
     @property
     def rate_limiter(self):
         """Access to the rate limiter."""
@@ -963,6 +1252,11 @@ class TXTDownloader:
         """Access to current download counts."""
         return self._rate_limiter.get_counts()
 
+    @cached_property
+    def aps_downloader(self) -> APSDownloader:
+        """APS downloader reused for every APS DOI, so its session stays alive."""
+        return APSDownloader()
+
     def identify_publisher_and_type(self, doi: str) -> tuple:
         """
         Identify the publisher and type of the document based on DOI.
@@ -972,29 +1266,17 @@ class TXTDownloader:
         Returns:
             tuple: (publisher, doc_type)
         """
-        doi_lower = doi.lower()
+        # Publisher identification by DOI prefix
+        publisher = PUBLISHER_BY_DOI_PREFIX.get(doi.split("/", 1)[0])
+        if publisher is not None:
+            return publisher
 
-        # Check for preprint servers first
-        if "biorxiv" in doi_lower or "10.1101" in doi_lower:
+        # Preprint servers that do not have a fixed prefix
+        doi_lower = doi.lower()
+        if "biorxiv" in doi_lower:
             return "biorxiv", "preprint"
-        elif "arxiv" in doi_lower or "arxiv.org" in doi_lower:
+        elif "arxiv" in doi_lower:
             return "arxiv", "preprint"
-
-        # Publisher identification by DOI prefix
-        if "10.1016" in doi_lower or "10.1006" in doi_lower:
-            return "elsevier", "journal"
-        elif "10.1007" in doi_lower or "10.1038" in doi_lower or "10.1186" in doi_lower:
-            return "springer", "journal"
-        elif "10.1002" in doi_lower or "10.1111" in doi_lower:
-            return "wiley", "journal"
-        elif "10.1371" in doi_lower:
-            return "plos", "journal"
-        elif "10.3389" in doi_lower:
-            return "frontiers", "journal"
-        elif "10.1094" in doi_lower:
-            return "aps", "journal"
-        elif "10.1109" in doi_lower:
-            return "ieee", "journal"
         else:
             return "unknown", "unknown"
 
@@ -1016,10 +1298,15 @@ class TXTDownloader:
         params = {"api_key": self.api_keys["springer-nature"], "q": f'doi:"{doi}"'}
 
         try:
-            response = self.session.get(url, params=params, timeout=30)
-            if response.status_code == 200:
-                text = ProcessSpringerXML(response.content).extract_metadata()
-                return text, None
+            # The body is parsed straight from the socket instead of being read
+            # into memory first; parsing stops at the first <article>
+            with self.session.get(
+                url, params=params, timeout=30, stream=True
+            ) as response:
+                if response.status_code == 200:
+                    response.raw.decode_content = True
+                    text = ProcessSpringerXML(response.raw).extract_metadata()
+                    return text, None
         except Exception as e:
             return None, log_text.error(
                 f"Error fetching Springer OpenAccess for DOI {doi}: {e}"
@@ -1066,6 +1353,9 @@ class TXTDownloader:
             return None, "No Wiley API key"
 
         try:
+            # wiley_tdm is only imported when a Wiley DOI is actually processed
+            from wiley_tdm import TDMClient
+
             tdm = TDMClient()
             tdm.download_dir = self.output_dir
             local_path = tdm.download_pdf(doi)
@@ -1081,16 +1371,18 @@ class TXTDownloader:
         Args:
             doi (str): Document DOI.
         Returns:
-            tuple: (pdf_content as bytes or None, error message or None)
+            tuple: (streamed PDF response or None, error message or None)
         """
         try:
             if "10.3389" in doi:
                 # Frontiers PDF URL pattern
                 pdf_url = f"https://www.frontiersin.org/articles/{doi}/pdf"
 
-                response = self.session.get(pdf_url, timeout=30)
+                # The body is left unread so download_txt can stream it to disk
+                response = self.session.get(pdf_url, timeout=30, stream=True)
                 if response.status_code == 200:
-                    return response.content, None
+                    return response, None
+                response.close()
 
             return None, "Frontiers PDF not found"
         except Exception as e:
@@ -1120,6 +1412,18 @@ class TXTDownloader:
         except Exception as e:
             return None, log_text.error(f"Unpaywall request failed: {str(e)}")
 
+    def save_response(self, response: requests.Response, filename: Path):
+        """Stream the body of a response to a file
+        Args:
+            response (requests.Response): Response requested with stream=True.
+            filename (Path): Path to save the file.
+        """
+        # Copy the raw stream to disk in 1 MiB blocks, undoing any
+        # gzip/deflate transfer encoding on the way
+        response.raw.decode_content = True
+        with open(filename, "wb") as f:
+            shutil.copyfileobj(response.raw, f, length=1 << 20)
+
     def download_pdf(self, pdf_url: str, filename: Path) -> bool:
         """Download PDF from URL
         Args:
@@ -1129,13 +1433,11 @@ class TXTDownloader:
             bool: True if download succeeded, False otherwise.
         """
         try:
-            response = requests.get(pdf_url, timeout=30, stream=True)
-            if response.status_code == 200:
-                with open(filename, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                log_text.info(f"Downloaded PDF: {filename}")
-                return True
+            with self.session.get(pdf_url, timeout=30, stream=True) as response:
+                if response.status_code == 200:
+                    self.save_response(response, filename)
+                    log_text.info(f"Downloaded PDF: {filename}")
+                    return True
         except:
             pass
         return False
@@ -1149,7 +1451,15 @@ class TXTDownloader:
         Returns:
             dict: A structured dictionary with metadata and full text, or None if failed.
         """
-        safe_doi = re.sub(r"[^\w\-.]", "_", doi)
+        safe_doi = UNSAFE_DOI_CHARS.sub("_", doi)
+
+        # Skip DOIs already saved by a previous run, so reruns only fetch what is missing
+        for suffix in (".pdf", ".json"):
+            existing = self.output_dir / f"{safe_doi}{suffix}"
+            if existing.is_file() and existing.stat().st_size > 0:
+                log_text.info(f"Already downloaded: {existing}")
+                return None
+
         publisher, doc_type = self.identify_publisher_and_type(doi)
         log_text.info(
             f"Processing DOI: {doi} | Publisher: {publisher} | Type: {doc_type}"
@@ -1179,8 +1489,7 @@ class TXTDownloader:
                 return None
 
         elif publisher == "aps":
-            apsdownload = APSDownloader()
-            pdf_content, error_msg = apsdownload.get_aps_pdf(doi)
+            pdf_content, error_msg = self.aps_downloader.get_aps_pdf(doi)
             source_used = "American Phytopathological Society (APS)"
             # download_counts["aps"] += 1
 
@@ -1220,11 +1529,11 @@ class TXTDownloader:
             except Exception as e:
                 log_text.error(f"Error saving PDF for DOI {doi}: {str(e)}")
                 return doi
-        elif isinstance(pdf_content, bytes):
+        elif isinstance(pdf_content, requests.Response):
             filename = self.output_dir / f"{safe_doi}.pdf"
             try:
-                with open(filename, "wb") as f:
-                    f.write(pdf_content)
+                with pdf_content:
+                    self.save_response(pdf_content, filename)
                 log_text.info(f"Saved PDF: {filename} | Source: {source_used}")
                 return None
             except Exception as e:
@@ -1233,8 +1542,8 @@ class TXTDownloader:
         else:
             filename = self.output_dir / f"{safe_doi}.json"
 
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(pdf_content, f, indent=2, ensure_ascii=False)
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(pdf_content, option=JSON_DUMP_OPTIONS))
             log_text.info(
                 f"Saved structured TXT JSON: {filename} | Source: {source_used}"
             )
@@ -1312,26 +1621,8 @@ def is_valid_doi(doi: str) -> bool:
     if not doi:
         return False
 
-    # DOI should start with 10. and have at least one more segment
-    if not doi.startswith("10."):
-        return False
-
-    # Should have at least one slash after 10.
-    parts = doi.split("/")
-    if len(parts) < 2:
-        return False
-
-    # Check for incomplete patterns
-    incomplete_patterns = [
-        r"^10\.3389/fpls$",  # Frontiers incomplete
-        r"^10\.[\d]+$",  # Just the prefix
-    ]
-
-    for pattern in incomplete_patterns:
-        if re.match(pattern, doi):
-            return False
-
-    return True
+    # One anchored match covers the prefix, the slash and the incomplete patterns
+    return VALID_DOI_PATTERN.match(doi) is not None
 
 
 def extract_doi_from_url(url: str) -> str | None:
@@ -1346,14 +1637,13 @@ def extract_doi_from_url(url: str) -> str | None:
     unq = unquote(url)  # decode %2F, etc.
 
     # 1) General DOI anywhere in the URL (stop at next slash, ? or #)
-    doi_re = re.compile(r"(10\.\d{4,9}/[^/?#\s]+)", re.IGNORECASE)
-    m = doi_re.search(unq)
+    m = URL_DOI_PATTERN.search(unq)
     if m:
         doi = m.group(1).rstrip(".,;:")  # trim trailing punctuation
         return doi
 
     # 2) Query param fallback (e.g., ?doi=10.XXX/YYY)
-    parsed = urlparse(unq)
+    parsed = urlsplit(unq)
     qs = parse_qs(parsed.query)
     for k in ("doi", "DOI"):
         if k in qs and qs[k]:
@@ -1363,53 +1653,69 @@ def extract_doi_from_url(url: str) -> str | None:
 
     # 3) Host-specific fallback (e.g., frontiers path heuristics)
     path = parsed.path
-    m = re.search(r"/articles/(10\.\d{4,9}/[^/]+)", path, re.IGNORECASE)
+    m = ARTICLES_PATH_DOI_PATTERN.search(path)
     if m:
         return m.group(1).rstrip(".,;:")
 
     return None
 
 
-def pmid2doi(pmid: str) -> str | None:
+def doi_from_esummary(uid_data: dict) -> str | None:
     """
-    Convert a PubMed ID (PMID) to a DOI using the NCBI E-utilities API.
+    Find the DOI in the esummary record of one PubMed article.
     Args:
-        pmid (str): The PubMed ID to convert.
+        uid_data (dict): The esummary result of the PMID.
     Returns:
-        str | None: The corresponding DOI if found, otherwise None.
+        str | None: The DOI if found, otherwise None.
     """
-    if not pmid or not pmid.isdigit():
-        return None
-
-    url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi?db=pubmed&id={pmid}&retmode=json"
-
-    try:
-        response = requests.get(url, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            result = data.get("result", {})
-            uid_data = result.get(pmid, {})
-
-            # Check multiple possible locations for DOI
-            # 1. Check articleids array for DOI entries
-            article_ids = uid_data.get("articleids", [])
-            for article_id in article_ids:
-                if article_id.get("idtype") == "doi":
-                    doi = article_id.get("value")
-                    if doi and doi.startswith("10."):
-                        return doi
-
-            # 2. Check elocationid as fallback
-            doi = uid_data.get("elocationid")
+    # Check multiple possible locations for DOI
+    # 1. Check articleids array for DOI entries
+    article_ids = uid_data.get("articleids", [])
+    for article_id in article_ids:
+        if article_id.get("idtype") == "doi":
+            doi = article_id.get("value")
             if doi and doi.startswith("10."):
                 return doi
 
-    except Exception as e:
-        log_text.error(f"Error converting PMID {pmid} to DOI: {e}")
+    # 2. Check elocationid as fallback
+    doi = uid_data.get("elocationid")
+    if doi and doi.startswith("10."):
+        return doi
 
     return None
 
 
+def pmids2dois(pmids: list[str]) -> dict[str, str | None]:
+    """
+    Convert PubMed IDs (PMIDs) to DOIs using the NCBI E-utilities API.
+
+    The PMIDs are looked up in batches of ESUMMARY_BATCH_SIZE, one request each.
+    Args:
+        pmids (list[str]): The PubMed IDs to convert.
+    Returns:
+        dict[str, str | None]: The DOI of each PMID, or None if not found.
+    """
+    dois = dict.fromkeys(pmids)
+    valid_pmids = [pmid for pmid in dois if pmid and pmid.isdigit()]
+
+    for start in range(0, len(valid_pmids), ESUMMARY_BATCH_SIZE):
+        batch = valid_pmids[start : start + ESUMMARY_BATCH_SIZE]
+        url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi?db=pubmed&id={','.join(batch)}&retmode=json"
+
+        try:
+            ncbi_limiter.acquire()
+            response = http_session.get(url, timeout=30)
+            if response.status_code == 200:
+                result = response.json().get("result", {})
+                for pmid in batch:
+                    dois[pmid] = doi_from_esummary(result.get(pmid, {}))
+
+        except Exception as e:
+            log_text.error(f"Error converting PMIDs {', '.join(batch)} to DOIs: {e}")
+
+    return dois
+
+
 def main():
     parser = get_parser()
     args = parser.parse_args()
@@ -1422,87 +1728,91 @@ def main():
         log_text.error(f"Input path is not a directory: {input_dir}")
         return
 
-    all_errors = defaultdict()
+    all_errors = defaultdict(list)
+    # Failed DOIs of each BioProject, written out once all files are processed
+    failed_logs = {}
+    # DOIs are downloaded concurrently; the per-API limits live in the rate limiter
+    executor = ThreadPoolExecutor(max_workers=16)
     # Process each JSON file in the input directory
     for json_file in input_dir.glob("*.json"):
-        logger_dict = defaultdict()
+        bioproject_name = json_file.stem.removesuffix("_articles")
+        logger_dict = defaultdict(list)
         log_text.info(f"Processing file: {json_file}")
         try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            articles = data.get("articles")
-            if len(articles) > 0:
-                for article in articles:
-                    doi = fix_doi(article)
-                    if doi:
-                        bioproject_name = (
-                            str(json_file).split("/")[-1].split("_articles.json")[0]
-                        )
-                        downloader = TXTDownloader(
-                            api_keys_file, email, input_dir, bioproject_name
-                        )
-                        result = downloader.download_txt(doi)
-
-                        if result is None:
-                            log_text.info(f"Successfully processed DOI: {doi}")
-                        else:
-                            log_text.error(
-                                f"Failed to process DOI: {doi} | Error: {result}"
-                            )
-                            logger_dict[bioproject_name] = logger_dict.get(
-                                bioproject_name, []
-                            ) + [doi]
+            with open(json_file, "rb") as f:
+                data = orjson.loads(f.read())
+            # One downloader per BioProject; all of them share the pooled session
+            downloader = TXTDownloader(api_keys_file, email, input_dir, bioproject_name)
+            articles = data.get("articles") or []
+            # Resolve the DOI of every article once, dropping those without one
+            dois = [doi for doi in map(fix_doi, articles) if doi]
+            # A DOI listed more than once (or reached again through a PMID) is
+            # downloaded and parsed only once; its entries share the same future
+            doi_futures = {}
+            article_futures = []
+            for doi in dois:
+                if doi not in doi_futures:
+                    doi_futures[doi] = executor.submit(downloader.download_txt, doi)
+                article_futures.append((doi, doi_futures[doi]))
             pmids = data.get("PubMedIDs", None)
+            pmid_futures = []
             if pmids:
+                # PMIDs are resolved with batched esummary requests
+                doi_map = pmids2dois(pmids)
                 for pmid in pmids:
-                    doi = pmid2doi(pmid)
-                    bioproject_name = (
-                        str(json_file).split("/")[-1].split("_articles.json")[0]
-                    )
-                    if doi:
-                        downloader = TXTDownloader(
-                            api_keys_file, email, input_dir, bioproject_name
+                    doi = doi_map[pmid]
+                    if doi and doi not in doi_futures:
+                        doi_futures[doi] = executor.submit(downloader.download_txt, doi)
+                    pmid_futures.append((pmid, doi, doi_futures.get(doi)))
+
+            # Collect the results in submission order so the error log keeps the
+            # order of the input file
+            for doi, future in article_futures:
+                result = future.result()
+
+                if result is None:
+                    log_text.info(f"Successfully processed DOI: {doi}")
+                else:
+                    log_text.error(f"Failed to process DOI: {doi} | Error: {result}")
+                    logger_dict[bioproject_name].append(doi)
+            for pmid, doi, future in pmid_futures:
+                if future is not None:
+                    result = future.result()
+
+                    if result is None:
+                        log_text.info(
+                            f"Successfully processed PMID: {pmid} -> DOI: {doi}"
                         )
-                        result = downloader.download_txt(doi)
-
-                        if result is None:
-                            log_text.info(
-                                f"Successfully processed PMID: {pmid} -> DOI: {doi}"
-                            )
-                        else:
-                            log_text.error(
-                                f"Failed to process PMID: {pmid} -> DOI: {doi} | Error: {result}"
-                            )
-                            logger_dict[bioproject_name] = logger_dict.get(
-                                bioproject_name, []
-                            ) + [doi]
                     else:
-                        log_text.error(f"Could not convert PMID to DOI: {pmid}")
-                        logger_dict[bioproject_name] = logger_dict.get(
-                            bioproject_name, []
-                        ) + [f"PMID:{pmid}"]
-            # To avoid hitting rate limits
-            time.sleep(randint(1, 3))
+                        log_text.error(
+                            f"Failed to process PMID: {pmid} -> DOI: {doi} | Error: {result}"
+                        )
+                        logger_dict[bioproject_name].append(doi)
+                else:
+                    log_text.error(f"Could not convert PMID to DOI: {pmid}")
+                    logger_dict[bioproject_name].append(f"PMID:{pmid}")
             downloader.print_status()
         except Exception as e:
             log_text.error(f"Error processing file {json_file}: {str(e)}")
-            
-
-        # Savinf the log of failed DOIs in the folder
-        bioproject_name = str(json_file).split("/")[-1].split("_articles.json")[0]
-        error_file = bioproject_name + "/failed_dois.json"
-        output_dir = input_dir / "files" / error_file
-        output_dir.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_dir, "w", encoding="utf-8") as f:
-            json.dump(logger_dict, f, indent=2, ensure_ascii=False)
-        log_text.info(f"Saved error log to: {output_dir}")
+
+        failed_logs[bioproject_name] = logger_dict
+        for name, failed in logger_dict.items():
+            all_errors[name].extend(failed)
         log_text.info("")
-        all_errors.update(logger_dict)
+
+    # Save the log of failed DOIs in each BioProject folder
+    for bioproject_name, logger_dict in failed_logs.items():
+        error_file = input_dir / "files" / bioproject_name / "failed_dois.json"
+        error_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(error_file, "wb") as f:
+            f.write(orjson.dumps(logger_dict, option=JSON_DUMP_OPTIONS))
+        log_text.info(f"Saved error log to: {error_file}")
     # Save a combined log of all failed DOIs
     combined_error_file = input_dir / "files" / "all_failed_dois.json"
-    with open(combined_error_file, "w", encoding="utf-8") as f:
-        json.dump(all_errors, f, indent=2, ensure_ascii=False)
+    with open(combined_error_file, "wb") as f:
+        f.write(orjson.dumps(all_errors, option=JSON_DUMP_OPTIONS))
     log_text.info(f"Saved combined error log to: {combined_error_file}")
+    executor.shutdown()
     downloader.print_status()
 
 if __name__ == "__main__":
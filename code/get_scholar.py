@@ -11,13 +11,14 @@
 import logging
 from selenium import webdriver
 from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.firefox.options import Options
 from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.common.by import By
 import time
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 import regex as re
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from random import randint
 import pandas as pd
 from datetime import datetime
@@ -39,6 +40,37 @@ log_text = logging.getLogger("rich")
 log_text.setLevel(20)
 
 URL = r"https://scholar.google.com/scholar?q="
+CITES_PATTERN = re.compile(r'Cited by (\d+)')
+# Scholar separates words with non-breaking spaces and uses en/em dashes in its snippets
+TEXT_TRANSLATION = str.maketrans({'\xa0': ' ', '\u2013': '-', '\u2014': '-'})
+
+# Columns added to the bioproject DataFrame, in the order they are written, with their defaults
+SCHOLAR_COLUMN_DEFAULTS = {
+    'scholar_articles_count': 0,
+    'scholar_total_citations': 0,
+    'scholar_avg_citations': 0.0,
+    'scholar_max_citations': 0,
+    'scholar_top_article': None,
+    'scholar_processed': False,
+    'scholar_timestamp': None,
+    'scholar_links': None,
+}
+
+# Collects title, link, citation text and description of the first 5 results in the
+# browser, so a results page costs one WebDriver round-trip instead of several per article
+ARTICLES_SCRIPT = '''
+return Array.from(document.querySelectorAll('[data-lid]')).slice(0, 5).map(el => {
+    const title = el.querySelector('h3 a');
+    const cites = el.querySelector('a[href*="cites"]');
+    const description = el.querySelector('.gs_rs');
+    return {
+        title: title ? title.innerText : null,
+        link: title ? title.href : null,
+        cites: cites ? cites.innerText : '',
+        description: description ? description.innerText : null
+    };
+});
+'''
 
 
 def start_driver() -> webdriver.Firefox:
@@ -48,7 +80,12 @@ def start_driver() -> webdriver.Firefox:
     Returns:
         WebDriver: The initialized Selenium WebDriver instance.
     '''
-    driver = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()))
+    options = Options()
+    # Results are read from the initial DOM, so don't wait for subresources or load images
+    options.page_load_strategy = 'eager'
+    options.set_preference('permissions.default.image', 2)
+    # options.add_argument('--headless')  # optional: run in headless mode
+    driver = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()), options=options)
     log_text.info("Driver ok!")
     driver.implicitly_wait(10)
     return driver
@@ -75,62 +112,43 @@ def extract_article_data(driver, bioproject_id: str|None = None, filter_by_biopr
             EC.presence_of_element_located((By.CSS_SELECTOR, '[data-lid]'))
         )
         
-        # Find all article containers
-        article_elements = driver.find_elements(By.CSS_SELECTOR, '[data-lid]')
-        
-        # Limit to first 5 results
-        article_elements = article_elements[:5]
-        
-        for element in article_elements:
+        # Extract the first 5 article containers in a single script call
+        for element in driver.execute_script(ARTICLES_SCRIPT):
+            # Skip this element if title not found
+            if element['title'] is None:
+                continue
+
             article_data = {}
+            article_data['title'] = element['title'].strip()
+            article_data['link'] = element['link']
             
-            try:
-                # Extract article title and link
-                title_element = element.find_element(By.CSS_SELECTOR, 'h3 a')
-                article_data['title'] = title_element.text.strip()
-                article_data['link'] = title_element.get_attribute('href')
-                
-                # Extract citation count
-                citation_count = 0
-                try:
-                    citation_element = element.find_element(By.CSS_SELECTOR, 'a[href*="cites"]')
-                    citation_text = citation_element.text
-                    # Extract number from "Cited by X" text
-                    citation_match = re.search(r'Cited by (\d+)', citation_text)
-                    if citation_match:
-                        citation_count = int(citation_match.group(1))
-                except NoSuchElementException:
-                    # No citations found for this article
-                    pass
-                
-                article_data['citations'] = citation_count
-                
-                # If filtering is enabled, check if bioproject_id is in the article description
-                if filter_by_bioproject and bioproject_id:
-                    try:
-                        # Look for the description/snippet text below the title
-                        description_element = element.find_element(By.CSS_SELECTOR, '.gs_rs')
-                        description_text = description_element.text.strip()
-                        article_data['description'] = description_text
-                        
-                        # Only include article if bioproject_id is found in description
-                        if bioproject_id.upper() not in description_text.upper():
-                            continue
-                            
-                    except NoSuchElementException:
-                        # No description found, skip if filtering is enabled
-                        continue
-                
-                # Add bioproject_id to article data for tracking
-                article_data['bioproject_id'] = bioproject_id
+            # Extract citation count from "Cited by X" text
+            citation_count = 0
+            citation_match = CITES_PATTERN.search(element['cites'].translate(TEXT_TRANSLATION))
+            if citation_match:
+                citation_count = int(citation_match.group(1))
+            
+            article_data['citations'] = citation_count
+            
+            # If filtering is enabled, check if bioproject_id is in the article description
+            if filter_by_bioproject and bioproject_id:
+                # No description found, skip if filtering is enabled
+                if element['description'] is None:
+                    continue
+
+                description_text = element['description'].translate(TEXT_TRANSLATION).strip()
+                article_data['description'] = description_text
                 
-                # Only add if we found a title
-                if article_data['title']:
-                    articles.append(article_data)
-                    
-            except NoSuchElementException:
-                # Skip this element if title not found
-                continue
+                # Only include article if bioproject_id is found in description
+                if bioproject_id.upper() not in description_text.upper():
+                    continue
+            
+            # Add bioproject_id to article data for tracking
+            article_data['bioproject_id'] = bioproject_id
+            
+            # Only add if we found a title
+            if article_data['title']:
+                articles.append(article_data)
                 
     except TimeoutException:
         log_text.error("Timeout waiting for search results to load")
@@ -140,7 +158,8 @@ def extract_article_data(driver, bioproject_id: str|None = None, filter_by_biopr
 
 def scrape_multiple_bioprojects(bioproject_ids: list[str], filter_by_bioproject: bool = False, 
                                restart_interval: int|None = None, df: pd.DataFrame|None = None,
-                               bioproject_col: str = 'BioProject', main_csv_file: str|None = None) -> dict[str, list[dict]]:
+                               bioproject_col: str = 'BioProject', main_csv_file: str|None = None,
+                               flush_interval: int = 25) -> dict[str, list[dict]]:
     """
     Scrape Google Scholar articles for multiple bioproject IDs using a single driver session
     with optional periodic driver restarts and incremental DataFrame updates
@@ -152,7 +171,9 @@ def scrape_multiple_bioprojects(bioproject_ids: list[str], filter_by_bioproject:
                                    If None, no restart occurs.
         df (pd.DataFrame|None): Original DataFrame to update with results.
         bioproject_col (str): Name of the bioproject column in DataFrame.
-        main_csv_file (str|None): Path to main CSV file to save after each bioproject.
+        main_csv_file (str|None): Path to main CSV file to save the updated DataFrame to.
+        flush_interval (int): Number of updated bioprojects between saves of the main CSV.
+                              Pending updates are always saved when scraping stops.
 
     Returns:
         dict: Dictionary mapping bioproject_id to list of article data.
@@ -160,7 +181,16 @@ def scrape_multiple_bioprojects(bioproject_ids: list[str], filter_by_bioproject:
     all_results = {}
     driver = None
     processed_count = 0
+    # Bioprojects updated in the DataFrame since the main CSV was last written
+    pending_updates = 0
     
+    # Add the scholar columns and find the rows of every bioproject once, instead of
+    # checking the columns and scanning the bioproject column on each update
+    row_positions = None
+    if df is not None and main_csv_file is not None:
+        init_scholar_columns(df)
+        row_positions = df.groupby(bioproject_col, sort=False).indices
+
     # Set random restart interval if not specified
     if restart_interval is None:
         restart_interval = randint(3, 13)
@@ -191,11 +221,15 @@ def scrape_multiple_bioprojects(bioproject_ids: list[str], filter_by_bioproject:
             else:
                 log_text.info(f"Found {len(articles)} articles for {bioproject_id}")
 
-            # Update DataFrame and save main CSV after each bioproject if provided
+            # Update DataFrame after each bioproject and save main CSV every flush_interval
+            # bioprojects if provided, since each save rewrites the whole file
             if df is not None and main_csv_file is not None:
-                update_dataframe_single_bioproject(df, bioproject_id, articles, bioproject_col)
-                df.to_csv(main_csv_file, index=False, encoding='utf-8')
-                log_text.info(f"Updated main CSV: {main_csv_file}")
+                update_dataframe_single_bioproject(df, bioproject_id, articles, bioproject_col, row_positions)
+                pending_updates += 1
+                if pending_updates >= flush_interval:
+                    df.to_csv(main_csv_file, index=False, encoding='utf-8')
+                    log_text.info(f"Updated main CSV: {main_csv_file}")
+                    pending_updates = 0
             
             processed_count += 1
             
@@ -215,6 +249,10 @@ def scrape_multiple_bioprojects(bioproject_ids: list[str], filter_by_bioproject:
     finally:
         if driver:
             driver.quit()
+        # Save the updates not written yet, also when scraping stopped on an error
+        if pending_updates:
+            df.to_csv(main_csv_file, index=False, encoding='utf-8')
+            log_text.info(f"Updated main CSV: {main_csv_file}")
     
     return all_results
 
@@ -250,54 +288,65 @@ def save_individual_bioproject_results(bioproject_id: str, articles: list[dict],
     else:
         log_text.warning(f"No articles found for {bioproject_id}")
 
+def init_scholar_columns(df: pd.DataFrame) -> None:
+    """
+    Add the scholar columns missing from the DataFrame with their default values (in-place modification)
+
+    Args:
+        df (pd.DataFrame): DataFrame to update (modified in-place)
+    """
+    for column, default in SCHOLAR_COLUMN_DEFAULTS.items():
+        if column not in df.columns:
+            df[column] = default
+
+def citation_stats(articles: list[dict]) -> tuple[int, int, float, int, str|None]:
+    """
+    Compute the citation statistics of a bioproject's articles, reading each citation count once
+
+    Args:
+        articles (list[dict]): List of article data for a bioproject
+
+    Returns:
+        tuple: Article count, total, average and maximum citations, and the title of the most cited article
+    """
+    if not articles:
+        return 0, 0, 0, 0, None
+    citations = [article['citations'] for article in articles]
+    total_citations = sum(citations)
+    max_citations = max(citations)
+    top_article = articles[citations.index(max_citations)]['title']
+    return len(articles), total_citations, total_citations / len(articles), max_citations, top_article
+
 def update_dataframe_single_bioproject(df: pd.DataFrame, bioproject_id: str, articles: list[dict], 
-                                      bioproject_col: str = 'BioProject') -> None:
+                                      bioproject_col: str = 'BioProject',
+                                      row_positions: dict|None = None) -> None:
     """
     Update DataFrame with results for a single bioproject (in-place modification)
+    The scholar columns must exist, see init_scholar_columns
     
     Args:
         df (pd.DataFrame): DataFrame to update (modified in-place)
         bioproject_id (str): The bioproject ID that was processed
         articles (list[dict]): List of article data for this bioproject
         bioproject_col (str): Name of the bioproject column in df
+        row_positions (dict|None): Mapping of bioproject ID to the positions of its rows in df,
+                                   as built by df.groupby(bioproject_col).indices.
+                                   If None, the bioproject column is scanned.
     """
-    # Initialize columns if they don't exist
-    if 'scholar_articles_count' not in df.columns:
-        df['scholar_articles_count'] = 0
-    if 'scholar_total_citations' not in df.columns:
-        df['scholar_total_citations'] = 0
-    if 'scholar_avg_citations' not in df.columns:
-        df['scholar_avg_citations'] = 0.0
-    if 'scholar_max_citations' not in df.columns:
-        df['scholar_max_citations'] = 0
-    if 'scholar_top_article' not in df.columns:
-        df['scholar_top_article'] = None
-    if 'scholar_processed' not in df.columns:
-        df['scholar_processed'] = False
-    if 'scholar_timestamp' not in df.columns:
-        df['scholar_timestamp'] = None
-    if 'scholar_links' not in df.columns:
-        df['scholar_links'] = None
-
     # Calculate statistics for this bioproject
-    total_articles = len(articles)
-    total_citations = sum(article['citations'] for article in articles)
-    avg_citations = total_citations / total_articles if total_articles > 0 else 0
-    max_citations = max((article['citations'] for article in articles), default=0)
-    top_article = max(articles, key=lambda x: x['citations'])['title'] if articles else None
-    links = [article['link'] for article in articles] if articles else []
+    total_articles, total_citations, avg_citations, max_citations, top_article = citation_stats(articles)
+    # Links are stored as one '|'-separated string, which survives the CSV round-trip
+    links = '|'.join(article['link'] for article in articles)
     
     # Update all rows with this bioproject_id
     log_text.info(f"Updating DataFrame for {bioproject_id}: {total_articles} articles, {total_citations} total citations")
-    mask = df[bioproject_col] == bioproject_id
-    df.loc[mask, 'scholar_articles_count'] = total_articles
-    df.loc[mask, 'scholar_total_citations'] = total_citations
-    df.loc[mask, 'scholar_avg_citations'] = avg_citations
-    df.loc[mask, 'scholar_max_citations'] = max_citations
-    df.loc[mask, 'scholar_top_article'] = top_article
-    df.loc[mask, 'scholar_processed'] = True
-    df.loc[mask, 'scholar_timestamp'] = datetime.now().isoformat()
-    df.loc[mask, 'scholar_links'] = pd.Series([list(links) for _ in range(mask.sum())], index=df.index[mask])
+    if row_positions is None:
+        rows = (df[bioproject_col] == bioproject_id).to_numpy().nonzero()[0]
+    else:
+        rows = row_positions.get(bioproject_id, [])
+    df.iloc[rows, [df.columns.get_loc(column) for column in SCHOLAR_COLUMN_DEFAULTS]] = [
+        total_articles, total_citations, avg_citations, max_citations, top_article,
+        True, datetime.now().isoformat(), links]
 
 
 def update_dataframe_with_results(df: pd.DataFrame, results: dict[str, list[dict]], 
@@ -313,34 +362,22 @@ def update_dataframe_with_results(df: pd.DataFrame, results: dict[str, list[dict
     Returns:
         pd.DataFrame: Updated dataframe with new columns
     """
-    # Create summary statistics for each bioproject
-    bioproject_stats = {}
-    for bioproject_id, articles in results.items():
-        bioproject_stats[bioproject_id] = {
-            'total_articles_found': len(articles),
-            'total_citations': sum(article['citations'] for article in articles),
-            'avg_citations': sum(article['citations'] for article in articles) / len(articles) if articles else 0,
-            'max_citations': max((article['citations'] for article in articles), default=0),
-            'top_article_title': max(articles, key=lambda x: x['citations'])['title'] if articles else None
-        }
-    
-    # Add new columns to dataframe
-    df_copy = df.copy()
-    df_copy['scholar_articles_count'] = df_copy[bioproject_col].map(
-        lambda x: bioproject_stats.get(x, {}).get('total_articles_found', 0)
-    )
-    df_copy['scholar_total_citations'] = df_copy[bioproject_col].map(
-        lambda x: bioproject_stats.get(x, {}).get('total_citations', 0)
-    )
-    df_copy['scholar_avg_citations'] = df_copy[bioproject_col].map(
-        lambda x: bioproject_stats.get(x, {}).get('avg_citations', 0)
-    )
-    df_copy['scholar_max_citations'] = df_copy[bioproject_col].map(
-        lambda x: bioproject_stats.get(x, {}).get('max_citations', 0)
-    )
-    df_copy['scholar_top_article'] = df_copy[bioproject_col].map(
-        lambda x: bioproject_stats.get(x, {}).get('top_article_title', None)
-    )
+    # Create summary statistics for each bioproject, one row per bioproject
+    stats_columns = ['scholar_articles_count', 'scholar_total_citations', 'scholar_avg_citations',
+                     'scholar_max_citations', 'scholar_top_article']
+    bioproject_stats = {bioproject_id: citation_stats(articles) for bioproject_id, articles in results.items()}
+    stats_df = pd.DataFrame.from_dict(bioproject_stats, orient='index', columns=stats_columns)
+
+    # Look up the statistics of every row with a single hash join on the bioproject column
+    # (join keeps the row index), then fill in bioprojects without results
+    joined = df[[bioproject_col]].join(stats_df, on=bioproject_col)
+    count_columns = ['scholar_articles_count', 'scholar_total_citations', 'scholar_max_citations']
+    joined[count_columns] = joined[count_columns].fillna(0).astype('int64')
+    joined['scholar_avg_citations'] = joined['scholar_avg_citations'].fillna(0).infer_objects()
+
+    # Add new columns to a shallow copy, which leaves df untouched without copying its data
+    df_copy = df.copy(deep=False)
+    df_copy[stats_columns] = joined[stats_columns]
     
     return df_copy
 
@@ -348,7 +385,7 @@ def scrape_scholar_articles_batch(bioproject_ids: list[str], filter_by_bioprojec
                                  output_file: str|None = None, save_individual: bool = True,
                                  output_dir: str = "scholar_results", df: pd.DataFrame|None = None,
                                  bioproject_col: str = 'BioProject', 
-                                 main_csv_file: str|None = None) -> dict[str, list[dict]]:
+                                 main_csv_file: str|None = None, flush_interval: int = 25) -> dict[str, list[dict]]:
     """
     Wrapper function to scrape multiple bioproject IDs and save results
 
@@ -360,14 +397,15 @@ def scrape_scholar_articles_batch(bioproject_ids: list[str], filter_by_bioprojec
         output_dir (str): Directory to save individual files.
         df (pd.DataFrame|None): Original DataFrame to update incrementally.
         bioproject_col (str): Name of the bioproject column in DataFrame.
-        main_csv_file (str|None): Path to main CSV file to save after each bioproject.
+        main_csv_file (str|None): Path to main CSV file to save the updated DataFrame to.
+        flush_interval (int): Number of updated bioprojects between saves of the main CSV.
 
     Returns:
         dict: Dictionary mapping bioproject_id to list of article data.
     """
     results = scrape_multiple_bioprojects(bioproject_ids, filter_by_bioproject, 
                                         df=df, bioproject_col=bioproject_col, 
-                                        main_csv_file=main_csv_file)
+                                        main_csv_file=main_csv_file, flush_interval=flush_interval)
     
     # Save individual files for each bioproject
     if save_individual:
@@ -401,7 +439,8 @@ def read_df(file_path: str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: The loaded DataFrame.
     """
-    return pd.read_csv(file_path, header=0, low_memory=False)
+    # Bioproject IDs repeat across runs, so store them as a categorical
+    return pd.read_csv(file_path, header=0, low_memory=False, dtype={'BioProject': 'category'})
 
 def get_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -447,7 +486,7 @@ if __name__ == "__main__":
         output_dir="scholar_results",  # Directory for individual files
         df=df,  # Your DataFrame
         bioproject_col='BioProject',  # Column name
-        main_csv_file=main_csv_file  # Main CSV file to update after each bioproject
+        main_csv_file=main_csv_file  # Main CSV file to update every 25 bioprojects
     )
 
     log_text.info(f"Final updated DataFrame saved to {main_csv_file}")